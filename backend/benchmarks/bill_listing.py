@@ -0,0 +1,118 @@
+"""
+Benchmark the bill list queries: whole documents vs. projected list rows.
+
+Seeds a scratch database on a local MongoDB with bills shaped like the
+scraper's (raw Congress.gov payload fields plus a long generated summary),
+then runs the /api/bills query both ways and reports the response size and
+latency percentiles:
+
+  full  find() of whole documents, every field of the row kept, json.dumps
+  lean  find() with LIST_PROJECTION, truncated summary, orjson
+
+Usage (from backend/, with MongoDB running):
+    python -m benchmarks.bill_listing --bills 5000 --iterations 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from bill_listing import LIST_PROJECTION, bill_list_item
+
+WORDS = ("appropriations act amend section federal program funding state grant health "
+         "energy secretary authority report committee public law provide require").split()
+
+
+def fake_bill(n: int, rng: random.Random) -> dict:
+    def text(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    return {
+        "number": str(n),
+        "congress": 118,
+        "type": rng.choice(["HR", "S", "HRES", "SRES"]),
+        "title": text(12).capitalize(),
+        "originChamber": "House",
+        "originChamberCode": "H",
+        "updateDate": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "updateDateIncludingText": "2024-06-01T12:00:00Z",
+        "url": f"https://api.congress.gov/v3/bill/118/hr/{n}?format=json",
+        "latestAction": {"actionDate": "2024-06-01", "text": "Referred to the " + text(6)},
+        "pdf_link": f"https://www.congress.gov/118/bills/hr{n}/BILLS-118hr{n}ih.pdf",
+        "text_link": f"https://www.congress.gov/118/bills/hr{n}/BILLS-118hr{n}ih.htm",
+        "summary": text(600),
+        "vectorized": True,
+        "has_text": True,
+    }
+
+
+def full_rows(bills):
+    """What the list endpoints returned before: every row carries the whole summary"""
+    rows = []
+    for bill in bills:
+        pdf_link = bill.get("pdf_link")
+        rows.append({
+            "id": bill["number"],
+            "title": bill.get("title", ""),
+            "summary": bill.get("summary", None),
+            "status": bill.get("latestAction", {}).get("text", "Unknown"),
+            "type": bill.get("type", "Unknown"),
+            "congress": bill.get("congress", "Unknown"),
+            "pdf_link": [pdf_link] if isinstance(pdf_link, str) else pdf_link,
+            "latest_action": bill.get("latestAction", {}),
+        })
+    return json.dumps(rows).encode()
+
+
+async def run(collection, lean: bool, iterations: int):
+    latencies = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        if lean:
+            bills = await collection.find({}, LIST_PROJECTION).sort("title", 1).limit(100).to_list(length=100)
+            body = orjson.dumps([bill_list_item(bill) for bill in bills])
+        else:
+            bills = await collection.find().sort("title", 1).limit(100).to_list(length=100)
+            body = full_rows(bills)
+        latencies.append((time.perf_counter() - start) * 1000)
+        size = len(body)
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return size, statistics.median(latencies), p99
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bill list projection benchmark")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="congress_bills_benchmark")
+    parser.add_argument("--bills", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    collection = client[args.database].bills
+    await collection.drop()
+    rng = random.Random(0)
+    await collection.insert_many([fake_bill(n, rng) for n in range(args.bills)])
+    await collection.create_index("title")
+
+    try:
+        print(f"{'mode':>6} {'bytes':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for mode in ("full", "lean"):
+            size, p50, p99 = await run(collection, mode == "lean", args.iterations)
+            print(f"{mode:>6} {size:>10} {p50:>8.2f} {p99:>8.2f}")
+    finally:
+        await client.drop_database(args.database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Load test for /api/chat.
+
+Sends the same number of chat requests at increasing concurrency levels to a
+running backend and reports throughput. If request handling blocks the event
+loop, throughput stays flat as concurrency grows; with non-blocking I/O it
+scales until the upstream services become the bottleneck.
+
+Usage (from backend/, with the API running):
+    python -m benchmarks.chat_load --url http://localhost:8000 \
+        --congress 118 --bill-type hr --bill-id 1 --requests 64 --concurrency 1 4 16
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def run_level(client, url, payload, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            response = await client.post(url, json=payload)
+            if response.status_code != 200:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return total / elapsed, failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="/api/chat concurrency load test")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--congress", default="118")
+    parser.add_argument("--bill-type", default="hr")
+    parser.add_argument("--bill-id", default="1")
+    parser.add_argument("--message", default="What does this bill do?")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    payload = {
+        "message": args.message,
+        "bill_id": args.bill_id,
+        "bill_type": args.bill_type,
+        "congress": args.congress,
+    }
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        print(f"{'concurrency':>12} {'req/s':>8} {'failed':>7}")
+        for level in args.concurrency:
+            throughput, failures = await run_level(client, f"{args.url}/api/chat", payload, args.requests, level)
+            print(f"{level:>12} {throughput:>8.2f} {failures:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
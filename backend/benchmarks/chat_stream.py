@@ -0,0 +1,85 @@
+"""
+Time-to-first-byte of streamed vs. non-streamed chat answers.
+
+Starts a fake OpenAI-compatible completion server that generates tokens with
+a fixed delay, points GrokClient at it (GROK_API_URL) and measures:
+- chat_about_bill: time until the complete answer is returned
+- chat_about_bill_stream: time until the first delta, and until the last
+
+It also checks that the streamed deltas reassemble into the same answer.
+
+Usage (from backend/):
+    python -m benchmarks.chat_stream --tokens 200 --token-delay 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from aiohttp import web
+
+
+def fake_llm_app(tokens, delay):
+    words = [f"word{i} " for i in range(tokens)]
+
+    async def completions(request):
+        body = await request.json()
+        if not body.get("stream"):
+            await asyncio.sleep(delay * tokens)
+            return web.json_response({"choices": [{"message": {"content": "".join(words)}}]})
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in words:
+            await asyncio.sleep(delay)
+            chunk = {"choices": [{"delta": {"content": word}}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Streaming chat TTFB benchmark")
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--port", type=int, default=8798)
+    args = parser.parse_args()
+
+    runner = web.AppRunner(fake_llm_app(args.tokens, args.token_delay))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    os.environ["GROK_API_URL"] = f"http://127.0.0.1:{args.port}/v1/chat/completions"
+    os.environ.setdefault("GROK_API_KEY", "benchmark")
+    from grok_integration.client import GrokClient
+    client = GrokClient()
+
+    start = time.perf_counter()
+    full = await client.chat_about_bill("What does it do?", "Bill HR.1")
+    blocking_total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first = None
+    pieces = []
+    async for delta in client.chat_about_bill_stream("What does it do?", "Bill HR.1"):
+        if first is None:
+            first = time.perf_counter() - start
+        pieces.append(delta)
+    streaming_total = time.perf_counter() - start
+
+    print(f"non-streaming: first byte = last byte = {blocking_total * 1000:8.1f} ms")
+    print(f"streaming:     first byte {first * 1000:8.1f} ms, last byte {streaming_total * 1000:8.1f} ms")
+    print(f"streamed answer matches: {''.join(pieces).strip() == full}")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark the local embedding backend.
+
+Measures embedding throughput (chunks/sec) and recall@k of the labeled bill
+questions in benchmarks/fixtures.py against their answering section, with the
+section hidden among synthetic distractor chunks.
+
+Usage (from backend/):
+    python -m benchmarks.embeddings --chunks 5000 --distractors 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pinecone_integration.embeddings import get_embedder
+from benchmarks.fixtures import QUESTIONS, distractor_chunks, labeled_chunks
+
+
+def measure_throughput(embedder, chunks):
+    start = time.perf_counter()
+    embedder.embed_documents(chunks)
+    elapsed = time.perf_counter() - start
+    return len(chunks) / elapsed
+
+
+def measure_recall(embedder, distractors, ks=(1, 5, 10)):
+    labeled = labeled_chunks()
+    texts = [text for text, _, _ in labeled] + distractors
+    labels = [(bill_id, section) for _, bill_id, section in labeled]
+
+    matrix = embedder.embed_documents(texts)
+    hits = {k: 0 for k in ks}
+
+    for question, bill_id, section in QUESTIONS:
+        scores = matrix @ embedder.embed_query(question)
+        ranked = np.argsort(-scores)[:max(ks)]
+        for k in ks:
+            if any(i < len(labels) and labels[i] == (bill_id, section) for i in ranked[:k]):
+                hits[k] += 1
+
+    return {k: hits[k] / len(QUESTIONS) for k in ks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding throughput and recall benchmark")
+    parser.add_argument("--backend", default=None, help="Embedding backend (defaults to EMBEDDING_BACKEND)")
+    parser.add_argument("--dimension", type=int, default=None, help="Vector dimension")
+    parser.add_argument("--chunks", type=int, default=5000, help="Number of ~500 char chunks to embed")
+    parser.add_argument("--distractors", type=int, default=2000, help="Distractor chunks for the recall test")
+    args = parser.parse_args()
+
+    embedder = get_embedder(args.backend, args.dimension)
+    print(f"Backend: {type(embedder).__name__}, dimension: {embedder.dimension}")
+
+    rate = measure_throughput(embedder, distractor_chunks(args.chunks, seed=1))
+    print(f"Throughput: {rate:,.0f} chunks/sec")
+
+    recall = measure_recall(embedder, distractor_chunks(args.distractors))
+    for k, value in recall.items():
+        print(f"Recall@{k}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
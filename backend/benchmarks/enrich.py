@@ -0,0 +1,86 @@
+"""
+Benchmark bill enrichment throughput against a local mock of the Congress.gov API.
+
+The mock answers /bill/{congress}/{type}/{number}/text after a fixed latency
+and returns 429 for a fraction of requests, so the run exercises both the
+token bucket and the retry path. Reports bills enriched per minute for the
+async engine and, for comparison, the old sequential loop's ceiling
+(one request plus a one second sleep per bill).
+
+Usage (from backend/):
+    python -m benchmarks.enrich --bills 500 --concurrency 8 --rate-per-hour 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+os.environ.setdefault("CONGRESS_API_KEY", "benchmark")
+
+# The scraper runs from backend/scraper/ and imports its modules by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scraper"))
+
+
+def mock_api(latency, throttle_ratio):
+    async def bill_text(request):
+        await asyncio.sleep(latency)
+        if random.random() < throttle_ratio:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        base = "https://www.congress.gov/118/bills/hr1"
+        return web.json_response({"textVersions": [{"formats": [
+            {"type": "PDF", "url": f"{base}/BILLS-118hr1ih.pdf"},
+            {"type": "Formatted Text", "url": f"{base}/BILLS-118hr1ih.htm"},
+        ]}]})
+
+    app = web.Application()
+    app.router.add_get("/v3/bill/{congress}/{type}/{number}/text", bill_text)
+    return app
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Async enrichment benchmark")
+    parser.add_argument("--bills", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate-per-hour", type=float, default=100_000)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock API latency in seconds")
+    parser.add_argument("--throttle-ratio", type=float, default=0.02, help="Fraction of 429 responses")
+    parser.add_argument("--port", type=int, default=8797)
+    args = parser.parse_args()
+
+    runner = web.AppRunner(mock_api(args.latency, args.throttle_ratio))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    import fetch_engine
+    fetch_engine.BASE_URL = f"http://127.0.0.1:{args.port}/v3"
+    import congress_utils
+    congress_utils.BASE_URL = fetch_engine.BASE_URL
+
+    bills = [{"type": "HR", "congress": 118, "number": str(n)} for n in range(args.bills)]
+
+    # enrich_bill creates bin/ directories relative to the working directory
+    os.chdir(tempfile.mkdtemp())
+    async with fetch_engine.CongressFetcher(
+        rate_per_hour=args.rate_per_hour, concurrency=args.concurrency
+    ) as fetcher:
+        start = time.perf_counter()
+        await congress_utils.enrich_bills(fetcher, bills)
+        elapsed = time.perf_counter() - start
+
+    enriched = sum(1 for bill in bills if bill["has_text"])
+    print(f"Enriched {enriched}/{len(bills)} bills in {elapsed:.1f}s "
+          f"({fetcher.requests} requests, {fetcher.retries} retries)")
+    print(f"Async engine:    {enriched / elapsed * 60:10.0f} bills/min")
+    print(f"Sequential loop: {60 / (args.latency + 1):10.0f} bills/min (ceiling)")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Small labeled corpus of bill sections and questions used by the benchmarks.
+
+Each question points at the bill and section that answers it, so retrieval
+quality can be measured as recall@k without calling any external service.
+"""
+
+import random
+
+BILL_SECTIONS = [
+    {
+        "bill_id": "1001", "bill_type": "HR", "congress": 118,
+        "title": "Rural Broadband Expansion Act",
+        "sections": [
+            "SEC. 2. GRANT PROGRAM. The Secretary of Agriculture shall establish a grant program to fund the deployment of broadband internet service in unserved rural areas with fewer than 20,000 inhabitants.",
+            "SEC. 3. ELIGIBILITY. An eligible entity includes a cooperative, a tribal government, a municipality, or a private internet service provider that commits to offer download speeds of at least 100 megabits per second.",
+            "SEC. 4. AUTHORIZATION OF APPROPRIATIONS. There is authorized to be appropriated $2,000,000,000 for each of fiscal years 2025 through 2029 to carry out this Act.",
+        ],
+    },
+    {
+        "bill_id": "212", "bill_type": "S", "congress": 118,
+        "title": "Veterans Mental Health Access Act",
+        "sections": [
+            "SEC. 2. TELEHEALTH SERVICES. The Secretary of Veterans Affairs shall expand telehealth mental health counseling to veterans residing more than 40 miles from a medical facility.",
+            "SEC. 3. SUICIDE PREVENTION COORDINATORS. Each medical center of the Department shall employ at least two full-time suicide prevention coordinators.",
+            "SEC. 4. REPORT. Not later than one year after enactment, the Secretary shall submit to Congress a report on wait times for mental health appointments.",
+        ],
+    },
+    {
+        "bill_id": "3076", "bill_type": "HR", "congress": 117,
+        "title": "Postal Service Reform Act",
+        "sections": [
+            "SEC. 101. RETIREE HEALTH BENEFITS. Postal Service retirees who are entitled to Medicare part A shall enroll in Medicare part B as a condition of postal health benefits coverage.",
+            "SEC. 102. PREFUNDING REPEAL. The requirement that the Postal Service prefund retiree health benefits in advance is repealed, and past due payments are cancelled.",
+            "SEC. 202. DELIVERY STANDARD. The Postal Service shall maintain an integrated delivery network delivering mail and packages at least six days a week.",
+        ],
+    },
+    {
+        "bill_id": "58", "bill_type": "HR", "congress": 118,
+        "title": "Clean Water Infrastructure Act",
+        "sections": [
+            "SEC. 2. LEAD PIPE REPLACEMENT. The Administrator of the Environmental Protection Agency shall provide grants to replace lead service lines in public drinking water systems.",
+            "SEC. 3. PFAS STANDARDS. The Administrator shall promulgate a national primary drinking water regulation for perfluoroalkyl and polyfluoroalkyl substances within two years.",
+        ],
+    },
+    {
+        "bill_id": "900", "bill_type": "S", "congress": 118,
+        "title": "Student Loan Transparency Act",
+        "sections": [
+            "SEC. 2. DISCLOSURES. A lender shall disclose the annual percentage rate, total repayment amount, and monthly payment estimate to a borrower before disbursement of a private education loan.",
+            "SEC. 3. INCOME-DRIVEN REPAYMENT. The Secretary of Education shall cap monthly payments under income-driven repayment plans at 10 percent of discretionary income.",
+            "SEC. 4. PUBLIC SERVICE LOAN FORGIVENESS. Qualifying payments made while working for a nonprofit organization or government employer shall count toward forgiveness after 120 payments.",
+        ],
+    },
+]
+
+QUESTIONS = [
+    ("Which rural areas can get broadband grants?", "1001", 0),
+    ("Can a tribal government or cooperative apply?", "1001", 1),
+    ("What internet speed do providers have to offer?", "1001", 1),
+    ("How much money is authorized for broadband each year?", "1001", 2),
+    ("Does the bill expand telehealth counseling for veterans?", "212", 0),
+    ("How many suicide prevention coordinators must each medical center employ?", "212", 1),
+    ("Will the VA report on mental health wait times?", "212", 2),
+    ("Do postal retirees have to enroll in Medicare part B?", "3076", 0),
+    ("Is the retiree health prefunding requirement repealed?", "3076", 1),
+    ("How many days a week must mail be delivered?", "3076", 2),
+    ("Are there grants to replace lead service lines?", "58", 0),
+    ("What does the bill say about PFAS in drinking water?", "58", 1),
+    ("What must lenders disclose before a private student loan?", "900", 0),
+    ("Is there a cap on income-driven repayment payments?", "900", 1),
+    ("How many payments until public service loan forgiveness?", "900", 2),
+]
+
+FILLER_WORDS = (
+    "the secretary shall provide report agency program federal state section "
+    "amount fiscal year funds authorized committee subsection paragraph general "
+    "provision administrator department regulation entity eligible requirement"
+).split()
+
+
+def labeled_chunks():
+    """Return (chunk_text, bill_id, section_index) for every fixture section."""
+    return [
+        (text, bill["bill_id"], i)
+        for bill in BILL_SECTIONS
+        for i, text in enumerate(bill["sections"])
+    ]
+
+
+def distractor_chunks(count: int, seed: int = 7):
+    """Generate `count` bill-like filler chunks of ~500 characters."""
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(count):
+        words = [rng.choice(FILLER_WORDS) for _ in range(80)]
+        chunks.append(f"SEC. {rng.randint(1, 999)}. " + " ".join(words))
+    return chunks
@@ -0,0 +1,98 @@
+"""
+Benchmark per-request latency of pooled vs. per-request HTTP clients.
+
+Starts a local stub server and sends the same sequence of requests with:
+- a new httpx.AsyncClient / aiohttp.ClientSession per request (old behaviour)
+- the shared pools from http_clients.HttpClients (new behaviour)
+
+Against a local server this only measures TCP connection setup and client
+construction; against a TLS endpoint the savings also include the handshake.
+
+Usage (from backend/):
+    python -m benchmarks.http_pool --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+import httpx
+from aiohttp import web
+
+from http_clients import HttpClients
+
+
+async def start_stub(port):
+    async def completion(request):
+        await request.read()
+        return web.json_response({"choices": [{"message": {"content": "ok"}}]})
+
+    async def bill_text(request):
+        return web.Response(text="SEC. 1. SHORT TITLE. " * 200)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completion)
+    app.router.add_get("/bill.htm", bill_text)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def timed(fn, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(latencies), statistics.quantiles(latencies, n=100)[98]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Pooled HTTP client benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    runner = await start_stub(args.port)
+    completion_url = f"http://127.0.0.1:{args.port}/v1/chat/completions"
+    text_url = f"http://127.0.0.1:{args.port}/bill.htm"
+    body = {"model": "grok-beta", "messages": [{"role": "user", "content": "hi"}]}
+
+    async def httpx_per_request():
+        async with httpx.AsyncClient() as client:
+            (await client.post(completion_url, json=body)).json()
+
+    async def aiohttp_per_request():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(text_url) as response:
+                await response.text()
+
+    pools = HttpClients()
+    await pools.start()
+
+    async def httpx_pooled():
+        (await pools.httpx_client.post(completion_url, json=body)).json()
+
+    async def aiohttp_pooled():
+        async with pools.aiohttp_session.get(text_url) as response:
+            await response.text()
+
+    print(f"{'client':>28} {'mean ms':>9} {'p99 ms':>9}")
+    for name, fn in [
+        ("httpx, client per request", httpx_per_request),
+        ("httpx, pooled", httpx_pooled),
+        ("aiohttp, session per request", aiohttp_per_request),
+        ("aiohttp, pooled", aiohttp_pooled),
+    ]:
+        mean, p99 = await timed(fn, args.requests)
+        print(f"{name:>28} {mean:>9.3f} {p99:>9.3f}")
+
+    await pools.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Import-time budget check for the API.
+
+Imports main in fresh interpreters (with no Pinecone or Grok credentials,
+so any network call or eager client construction at import shows up as a
+failure) and fails if the fastest import exceeds the budget or if modules
+that should only load on first use (the Pinecone SDK, langchain, tiktoken)
+are imported. Prints the slowest top-level imports from -X importtime.
+
+Usage (from backend/):
+    python -m benchmarks.import_time --budget-ms 1000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Modules only the vector index and chat paths need, loaded on first use
+DEFERRED_MODULES = ("pinecone", "langchain", "tiktoken")
+
+CHECK = (
+    "import sys, main; "
+    "print(','.join(m for m in {deferred!r} if m in sys.modules))"
+)
+
+
+def import_once(env):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHECK.format(deferred=DEFERRED_MODULES)],
+        env=env, capture_output=True, text=True, timeout=120
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        sys.exit(f"Importing main failed:\n{result.stderr[-2000:]}")
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return elapsed, loaded, result.stderr
+
+
+def slowest_imports(importtime_log, top):
+    """Top-level (imported by main) modules by cumulative import time"""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and name.startswith("   ") and not name.startswith("    "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API import-time budget check")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1000")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    env = {
+        k: v for k, v in os.environ.items()
+        if k not in ("PINECONE_API_KEY", "GROK_API_KEY", "VECTOR_BACKEND")
+    }
+
+    import_once(env)  # Warm the OS file cache and the bytecode cache
+    timings = []
+    for _ in range(args.runs):
+        elapsed, loaded, log = import_once(env)
+        timings.append(elapsed)
+
+    best = min(timings)
+    print(f"import main: best {best:.0f} ms, median {sorted(timings)[len(timings) // 2]:.0f} ms "
+          f"over {args.runs} runs (interpreter startup included), budget {args.budget_ms:.0f} ms")
+    print("Slowest imports (cumulative ms):")
+    for cumulative, name in slowest_imports(log, args.top):
+        print(f"{cumulative:>10.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: deferred modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"FAIL: import took {best:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark bill search at scale: the old unanchored title regex vs. the
+indexed text and prefix modes of bill_search.
+
+Seeds a scratch database on a local MongoDB with --bills generated bills
+(search_terms included), creates the search indexes and reports p50/p99
+latency per mode over a fixed set of queries.
+
+Usage (from backend/, with MongoDB running):
+    python -m benchmarks.search --bills 100000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.bill_listing import fake_bill
+from bill_listing import LIST_PROJECTION
+from bill_search import ensure_search_indexes, search_bills, search_terms
+
+QUERIES = ["health", "energy grant", "appropriations act", "federal program funding", "secretary"]
+PREFIXES = ["he", "ener", "appropriations a", "federal prog", "sec"]
+
+
+async def timed(fn, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+async def seed(collection, count):
+    await collection.drop()
+    rng = random.Random(0)
+    batch = []
+    for n in range(count):
+        bill = fake_bill(n, rng)
+        bill["search_terms"] = search_terms(bill)
+        batch.append(bill)
+        if len(batch) == 5000:
+            await collection.insert_many(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch)
+    await ensure_search_indexes(collection)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bill search benchmark")
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="congress_bills_benchmark")
+    parser.add_argument("--bills", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    collection = client[args.database].bills
+    print(f"Seeding {args.bills} bills...")
+    await seed(collection, args.bills)
+
+    async def regex():
+        for query in QUERIES:
+            await collection.find({"title": {"$regex": query, "$options": "i"}}, LIST_PROJECTION).to_list(length=20)
+
+    async def text():
+        for query in QUERIES:
+            await search_bills(collection, query, "text", limit=20)
+
+    async def prefix():
+        for query in PREFIXES:
+            await search_bills(collection, query, "prefix", limit=20)
+
+    try:
+        print(f"{'mode':>8} {'p50 ms':>8} {'p99 ms':>8}   (per query)")
+        for name, fn, count in (("regex", regex, len(QUERIES)), ("text", text, len(QUERIES)),
+                                ("prefix", prefix, len(PREFIXES))):
+            p50, p99 = await timed(fn, args.iterations)
+            print(f"{name:>8} {p50 / count:>8.2f} {p99 / count:>8.2f}")
+    finally:
+        await client.drop_database(args.database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
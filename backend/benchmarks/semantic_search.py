@@ -0,0 +1,84 @@
+"""
+Benchmark /api/search/semantic's retrieval: latency and bill-level recall.
+
+Vectorizes the fixture bills plus synthetic distractor bills into a local
+vector index (VECTOR_BACKEND=local in a temp directory), then runs every
+labeled question through SemanticSearch and reports recall@k of the bill
+that answers it, p50/p99 latency of uncached, congress-filtered and cached
+queries.
+
+Usage (from backend/):
+    python -m benchmarks.semantic_search --distractor-bills 500
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import BILL_SECTIONS, QUESTIONS, distractor_chunks
+
+
+async def vectorize(client, distractor_bills):
+    for bill in BILL_SECTIONS:
+        await client.create_vectordb_from_text("\n\n".join(bill["sections"]), metadata={
+            "bill_id": bill["bill_id"], "title": bill["title"],
+            "congress": bill["congress"], "bill_type": bill["bill_type"]
+        })
+    chunks = distractor_chunks(distractor_bills * 4)
+    for n in range(distractor_bills):
+        await client.create_vectordb_from_text("\n\n".join(chunks[n * 4:n * 4 + 4]), metadata={
+            "bill_id": str(100_000 + n), "title": f"Distractor Act {n}",
+            "congress": 117 + n % 2, "bill_type": "HR"
+        })
+
+
+async def timed(search, queries, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(await search.search(query, **kwargs))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Semantic bill search benchmark")
+    parser.add_argument("--distractor-bills", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        os.environ["VECTOR_BACKEND"] = "local"
+        os.environ["LOCAL_INDEX_PATH"] = path
+        from pinecone_integration import PineconeClient
+        from semantic_search import SemanticSearch
+
+        client = PineconeClient()
+        await vectorize(client, args.distractor_bills)
+        search = SemanticSearch(client)
+        questions = [question for question, _, _ in QUESTIONS]
+
+        p50, p99, results = await timed(search, questions, limit=args.limit)
+        for k in (1, 3):
+            hits = sum(
+                any(r["bill_id"] == bill_id for r in ranked[:k])
+                for ranked, (_, bill_id, _) in zip(results, QUESTIONS)
+            )
+            print(f"Bill recall@{k}: {hits / len(QUESTIONS):.2f}")
+        print(f"{'query':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'uncached':>10} {p50:>8.2f} {p99:>8.2f}")
+
+        search.cache.clear()
+        p50, p99, _ = await timed(search, questions, congress=118, limit=args.limit)
+        print(f"{'filtered':>10} {p50:>8.2f} {p99:>8.2f}")
+
+        p50, p99, _ = await timed(search, questions, congress=118, limit=args.limit)
+        print(f"{'cached':>10} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark query latency of the local vector index.
+
+Builds a LocalIndex of random unit vectors spread over many bills in a temp
+directory and reports p50/p99 query latency for exact search, IVF search and
+a bill-scoped (metadata filtered) search at each size.
+
+Usage (from backend/):
+    python -m benchmarks.vector_index --sizes 10000 100000 1000000 --dimension 256
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from pinecone_integration.local_index import LocalIndex
+
+
+def build_index(path, size, dimension, chunks_per_bill=40, batch_size=10_000):
+    index = LocalIndex(path, dimension, mode="exact")
+    rng = np.random.default_rng(0)
+    for start in range(0, size, batch_size):
+        count = min(batch_size, size - start)
+        block = rng.standard_normal((count, dimension)).astype(np.float32)
+        index.upsert([
+            {
+                "id": f"{(start + i) // chunks_per_bill}_chunk_{(start + i) % chunks_per_bill}",
+                "values": block[i],
+                "metadata": {
+                    "bill_id": str((start + i) // chunks_per_bill),
+                    "bill_type": "HR",
+                    "congress": 118,
+                    "chunk_id": (start + i) % chunks_per_bill,
+                },
+            }
+            for i in range(count)
+        ])
+    return index
+
+
+def measure(index, queries, **kwargs):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.query(vector=query, top_k=25, include_metadata=True, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local vector index latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+
+    print(f"{'chunks':>10} {'mode':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as path:
+            index = build_index(path, size, args.dimension)
+
+            index.mode = "exact"
+            results = {"exact": measure(index, queries)}
+
+            index.build_ivf()
+            index.mode = "ivf"
+            results["ivf"] = measure(index, queries)
+
+            bill_filter = {"$and": [{"bill_id": "7"}, {"bill_type": "HR"}, {"congress": 118}]}
+            results["filter"] = measure(index, queries, filter=bill_filter)
+
+            for mode, (p50, p99) in results.items():
+                print(f"{size:>10} {mode:>8} {p50:>9.3f} {p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+In-process caches for hot reads.
+
+TTLCache is a size-bounded LRU with per-entry expiry that also coalesces
+concurrent loads of the same key. BillCache uses it for bill documents and
+their rendered responses, keyed on (congress, type, number), so the popular
+bills are served without a MongoDB round trip. Entries are invalidated when
+the API writes to a bill and, optionally, by a MongoDB change stream for
+writes from other processes (the scraper, other API workers); otherwise they
+expire after the TTL.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire `ttl` seconds after being set"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 300,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self):
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key: Hashable):
+        _, value = self._entries.pop(key)
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]):
+        """
+        Return the cached value for `key`, or load and cache it. Concurrent
+        misses for the same key share one load. None results are not cached.
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._loading[key] = future
+            try:
+                value = await asyncio.shield(future)
+            finally:
+                self._loading.pop(key, None)
+            if value is not None:
+                self.set(key, value)
+            return value
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+@dataclass
+class CachedBill:
+    doc: dict
+    last_modified: datetime
+    rendered: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)
+
+    def render(self, view: str, build: Callable[[dict], Any]) -> Tuple[bytes, str]:
+        """JSON body and ETag of one view of the bill, built once per cache entry"""
+        if view not in self.rendered:
+            body = orjson.dumps(build(self.doc))
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            self.rendered[view] = (body, etag)
+        return self.rendered[view]
+
+
+def bill_last_modified(doc: dict) -> datetime:
+    """Latest of the scraper's update date and the summary write time"""
+    candidates = [datetime(1970, 1, 1, tzinfo=timezone.utc)]
+    for name in ("updateDateIncludingText", "updateDate"):
+        value = doc.get(name)
+        if isinstance(value, str) and value:
+            try:
+                parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            candidates.append(parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc))
+    summary_updated_at = doc.get("summary_updated_at")
+    if isinstance(summary_updated_at, datetime):
+        candidates.append(summary_updated_at.replace(tzinfo=timezone.utc))
+    return max(candidates).replace(microsecond=0)
+
+
+def conditional_response(request: Request, body: bytes, etag: str, last_modified: datetime) -> Response:
+    """200 with validators, or 304 when the client's copy is still current"""
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache"  # Cache, but revalidate
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                if last_modified <= parsedate_to_datetime(if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class BillCache:
+    """Bill documents keyed on (congress, type, number)"""
+
+    def __init__(self, collection, max_entries: int = 2000, ttl: float = 300):
+        self.collection = collection
+        self.cache = TTLCache(max_entries, ttl, on_evict=self._forget)
+        self._keys_by_id: Dict[Any, tuple] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, collection) -> "BillCache":
+        return cls(
+            collection,
+            max_entries=int(os.getenv("BILL_CACHE_MAX_ENTRIES", "2000")),
+            ttl=float(os.getenv("BILL_CACHE_TTL", "300"))
+        )
+
+    @staticmethod
+    def key(congress, bill_type: str, number) -> tuple:
+        return (int(congress), bill_type.upper(), str(number))
+
+    async def get(self, congress, bill_type: str, number) -> Optional[CachedBill]:
+        key = self.key(congress, bill_type, number)
+
+        async def load():
+            # Vector manifests can be large and no response needs them
+            doc = await self.collection.find_one(
+                {"congress": key[0], "type": key[1], "number": key[2]},
+                {"vector_manifest": 0}
+            )
+            return CachedBill(doc, bill_last_modified(doc)) if doc else None
+
+        entry = await self.cache.get_or_load(key, load)
+        if entry is not None:
+            self._keys_by_id[entry.doc["_id"]] = key
+        return entry
+
+    def invalidate(self, bill: dict):
+        self.cache.invalidate(self.key(bill["congress"], bill["type"], bill["number"]))
+
+    def _forget(self, key, entry: CachedBill):
+        self._keys_by_id.pop(entry.doc["_id"], None)
+
+    def start_watching(self):
+        """Invalidate entries on writes from other processes (requires a replica set)"""
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        if self._watch_task:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def _watch(self):
+        pipeline = [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}]
+        while True:
+            try:
+                async with self.collection.watch(pipeline) as stream:
+                    logger.info("Watching bill changes for cache invalidation")
+                    async for change in stream:
+                        key = self._keys_by_id.get(change["documentKey"]["_id"])
+                        if key:
+                            self.cache.invalidate(key)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                # Standalone servers have no change streams; entries then just expire
+                logger.warning(f"Bill change stream unavailable, relying on TTL: {str(e)}")
+                if getattr(e, "code", None) == 40573:
+                    return
+                await asyncio.sleep(30)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,168 @@
+"""
+List views of bills (/api/bills, /api/trending-bills, /api/search).
+
+List endpoints only need a handful of fields per bill, so the MongoDB query
+projects those fields (with the summary cut down on the server) and rows are
+serialized straight to JSON with orjson. The full bill, including the whole
+summary, stays behind /api/bills/{congress}/{bill_type}/{bill_id}.
+
+Lists are paged with keyset pagination: rows are ordered by an allow-listed
+sort key plus _id, each pair backed by a compound index, and the next page
+starts after the last row of the previous one. The position is handed to the
+client as an opaque cursor in the X-Next-Cursor response header, so deep
+pages cost the same as the first one.
+"""
+
+import base64
+import json
+import os
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Characters of the summary included in list rows (0 omits it)
+LIST_SUMMARY_CHARS = int(os.getenv("LIST_SUMMARY_CHARS", 240))
+
+# Largest page a client can ask for
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+# Sort keys clients may use, mapped to bill document fields
+SORT_FIELDS = {
+    "title": "title",
+    "updateDate": "updateDate",
+    "latestActionDate": "latestAction.actionDate",
+}
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class BillListItem(BaseModel):
+    id: str
+    title: str
+    summary: Optional[str] = None  # Truncated, see LIST_SUMMARY_CHARS
+    status: str
+    type: str
+    congress: int
+    pdf_link: Optional[List[str]] = None
+    latest_action: Optional[dict] = None
+
+
+def list_projection(summary_chars: int = LIST_SUMMARY_CHARS) -> dict:
+    """MongoDB projection for list rows; the summary is truncated by the server"""
+    projection = {
+        "number": 1, "title": 1, "type": 1, "congress": 1,
+        "pdf_link": 1, "latestAction": 1, "updateDate": 1
+    }
+    if summary_chars > 0:
+        # One extra character tells whether the summary was cut
+        projection["summary"] = {"$substrCP": [{"$ifNull": ["$summary", ""]}, 0, summary_chars + 1]}
+    return projection
+
+
+LIST_PROJECTION = list_projection()
+
+
+def bill_list_item(bill: dict, summary_chars: int = LIST_SUMMARY_CHARS) -> dict:
+    """Shape a projected bill document as a BillListItem dict"""
+    summary = bill.get("summary") or None
+    if summary and len(summary) > summary_chars:
+        summary = summary[:summary_chars].rstrip() + "…"
+
+    pdf_link = bill.get("pdf_link")
+    if isinstance(pdf_link, str):
+        pdf_link = [pdf_link]
+    elif not isinstance(pdf_link, list):
+        pdf_link = None
+
+    latest_action = bill.get("latestAction") or {}
+    return {
+        "id": bill["number"],
+        "title": bill.get("title", ""),
+        "summary": summary,
+        "status": latest_action.get("text", "Unknown"),
+        "type": bill.get("type", "Unknown"),
+        "congress": bill.get("congress"),
+        "pdf_link": pdf_link,
+        "latest_action": latest_action
+    }
+
+
+def list_response(bills: List[dict], next_cursor: Optional[str] = None) -> ORJSONResponse:
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ORJSONResponse([bill_list_item(bill) for bill in bills], headers=headers)
+
+
+async def ensure_list_indexes(collection):
+    """Create the (sort field, _id) index backing every allowed sort key"""
+    for field in SORT_FIELDS.values():
+        await collection.create_index([(field, 1), ("_id", 1)])
+
+
+def _field_value(bill: dict, field: str):
+    for part in field.split("."):
+        bill = bill.get(part) if isinstance(bill, dict) else None
+    return bill
+
+
+def encode_cursor(bill: dict, sort_by: str, order: str) -> str:
+    """Opaque token pointing just after `bill` in the given ordering"""
+    position = {
+        "s": sort_by,
+        "o": order,
+        "v": _field_value(bill, SORT_FIELDS[sort_by]),
+        "id": str(bill["_id"]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> Tuple[object, ObjectId]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value, last_id = position["v"], ObjectId(position["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if position.get("s") != sort_by or position.get("o") != order:
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def page_query(sort_by: str, order: str, cursor: Optional[str] = None,
+               query: Optional[dict] = None) -> Tuple[dict, list]:
+    """
+    Build the filter and sort for one page of a keyset-paginated list.
+    Raises ValueError for sort keys outside SORT_FIELDS and bad cursors.
+    """
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+    field = SORT_FIELDS[sort_by]
+    direction = 1 if order == "asc" else -1
+    sort = [(field, direction), ("_id", direction)]
+    query = dict(query or {})
+    if not cursor:
+        return query, sort
+
+    value, last_id = decode_cursor(cursor, sort_by, order)
+    after = "$gt" if direction == 1 else "$lt"
+    ties = {field: value, "_id": {after: last_id}}
+    if value is None:
+        # Missing values sort before everything else
+        after_value = [{field: {"$ne": None}}] if direction == 1 else []
+    else:
+        after_value = [{field: {after: value}}]
+        if direction == -1:
+            after_value.append({field: None})
+    query["$and"] = query.get("$and", []) + [{"$or": [ties] + after_value}]
+    return query, sort
+
+
+def split_page(bills: List[dict], limit: int, sort_by: str, order: str) -> Tuple[List[dict], Optional[str]]:
+    """
+    Split the `limit + 1` rows fetched for a page into the page itself and
+    the cursor of the next page (None if there is no further row).
+    """
+    if len(bills) <= limit:
+        return bills, None
+    page = bills[:limit]
+    return page, encode_cursor(page[-1], sort_by, order)
@@ -0,0 +1,193 @@
+"""
+Indexed bill search for /api/search.
+
+Two query modes, both served from indexes:
+
+  text    MongoDB $text search over title, bill number and summary, ranked
+          by text score (title and number weigh more than the summary)
+  prefix  typeahead: every word but the last must match a title word, the
+          last one only needs to be a word prefix. Matched through the
+          `search_terms` multikey index with an anchored regex (an index
+          range scan rather than a collection scan), newest bills first.
+
+`search_terms` holds the lowercase title words and bill identifiers
+("hr1234", "1234") of a bill. The scraper writes it with every bill
+(scraper/sync_utils.py has the same tokenizer) and backfill_search_terms
+fills it in for bills stored before it existed.
+"""
+
+import base64
+import json
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from bill_listing import LIST_PROJECTION
+
+logger = logging.getLogger(__name__)
+
+TEXT_INDEX_NAME = "bill_search_text"
+TEXT_INDEX_WEIGHTS = {"title": 10, "number": 8, "summary": 2}
+
+# Shortest word prefix accepted in prefix mode
+MIN_PREFIX_LENGTH = 2
+
+# Deepest offset a search cursor may reach
+MAX_SEARCH_OFFSET = 1000
+
+SEARCH_MODES = ("text", "prefix")
+
+# MongoDB error code of drop_index on an index that no longer exists
+INDEX_NOT_FOUND = 27
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def search_terms(bill: dict) -> List[str]:
+    """Lowercase title words and identifiers indexed for prefix search"""
+    terms = set(tokenize(bill.get("title", "")))
+    number = str(bill.get("number", "")).lower()
+    if number:
+        terms.add(number)
+        terms.add(f"{str(bill.get('type', '')).lower()}{number}")
+    return sorted(terms)
+
+
+async def ensure_search_indexes(collection):
+    """
+    Create the weighted text index and the search_terms index. A collection
+    can only have one text index, so the old title-only one is dropped.
+    """
+    indexes = await collection.index_information()
+    for name, spec in indexes.items():
+        is_text = any(kind == "text" for _, kind in spec["key"])
+        if is_text and name != TEXT_INDEX_NAME:
+            try:
+                await collection.drop_index(name)
+            except OperationFailure as e:
+                # Another worker starting at the same time dropped it first
+                if e.code != INDEX_NOT_FOUND:
+                    raise
+
+    await collection.create_index(
+        [("title", "text"), ("number", "text"), ("summary", "text")],
+        name=TEXT_INDEX_NAME,
+        weights=TEXT_INDEX_WEIGHTS,
+        default_language="english"
+    )
+    await collection.create_index([("search_terms", 1)])
+
+
+async def prepare_search(collection):
+    """
+    Build the search indexes and backfill search_terms. Runs as a background
+    task at startup: building the text index on a large collection takes a
+    while, and listing and filtering do not need it.
+    """
+    try:
+        await ensure_search_indexes(collection)
+        await backfill_search_terms(collection)
+    except Exception as e:
+        logger.error(f"Search index setup failed: {str(e)}")
+
+
+async def backfill_search_terms(collection, batch_size: int = 1000):
+    """Set search_terms on bills stored before the field existed"""
+    updated = 0
+    while True:
+        bills = await collection.find(
+            {"search_terms": {"$exists": False}},
+            {"title": 1, "number": 1, "type": 1}
+        ).limit(batch_size).to_list(length=batch_size)
+        if not bills:
+            break
+        await collection.bulk_write([
+            UpdateOne({"_id": bill["_id"]}, {"$set": {"search_terms": search_terms(bill)}})
+            for bill in bills
+        ], ordered=False)
+        updated += len(bills)
+    if updated:
+        logger.info(f"Backfilled search terms for {updated} bills")
+
+
+def encode_offset(offset: int, query: str, mode: str) -> str:
+    position = {"q": query, "m": mode, "n": offset}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_offset(cursor: Optional[str], query: str, mode: str) -> int:
+    if not cursor:
+        return 0
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = int(position["n"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if position.get("q") != query or position.get("m") != mode:
+        raise ValueError("Cursor was issued for a different search")
+    if not 0 <= offset <= MAX_SEARCH_OFFSET:
+        raise ValueError("Cursor is out of range")
+    return offset
+
+
+def search_query(query: str, mode: str = "text", congress: Optional[int] = None,
+                 bill_type: Optional[str] = None) -> Tuple[dict, dict, Optional[list]]:
+    """
+    Build the filter, projection and sort of a search.
+    Returns an empty filter (no results) when the query has nothing to match.
+    Raises ValueError for unknown modes.
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(SEARCH_MODES)}")
+
+    filters = {}
+    if congress is not None:
+        filters["congress"] = congress
+    if bill_type:
+        filters["type"] = bill_type.upper()
+
+    tokens = tokenize(query)
+    if not tokens:
+        return {}, LIST_PROJECTION, None
+
+    if mode == "text":
+        filters["$text"] = {"$search": " ".join(tokens)}
+        projection = {**LIST_PROJECTION, "score": {"$meta": "textScore"}}
+        return filters, projection, [("score", {"$meta": "textScore"}), ("_id", -1)]
+
+    *words, prefix = tokens
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return {}, LIST_PROJECTION, None
+    clauses = [{"search_terms": {"$regex": f"^{re.escape(prefix)}"}}]
+    if words:
+        clauses.append({"search_terms": {"$all": words}})
+    filters["$and"] = clauses
+    # Newest first, with a unique key so skip/limit pages never overlap
+    return filters, LIST_PROJECTION, [("_id", -1)]
+
+
+async def search_bills(collection, query: str, mode: str = "text", congress: Optional[int] = None,
+                       bill_type: Optional[str] = None, limit: int = 20,
+                       cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of search results and the cursor of the next page (or None)"""
+    offset = decode_offset(cursor, query, mode)
+    filters, projection, sort = search_query(query, mode, congress, bill_type)
+    if not filters:
+        return [], None
+
+    bills_cursor = collection.find(filters, projection)
+    if sort:
+        bills_cursor = bills_cursor.sort(sort)
+    # Fetch one extra row to know whether there is a next page
+    bills = await bills_cursor.skip(offset).limit(limit + 1).to_list(length=limit + 1)
+
+    if len(bills) <= limit or offset + limit >= MAX_SEARCH_OFFSET:
+        return bills[:limit], None
+    return bills[:limit], encode_offset(offset + limit, query, mode)
@@ -0,0 +1,204 @@
+"""
+Bill text store: every text version is downloaded once, stripped of HTML and
+kept zstd-compressed on disk, so summarization, chunking and any later
+analysis read the clean text locally instead of re-downloading the HTML.
+
+Text versions are keyed by their URL (each Congress.gov text version has its
+own, e.g. .../BILLS-118hr1ih.htm). Next to each compressed text a small JSON
+file records the source URL, the SHA-256 of the clean text and the sizes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Optional
+
+import aiohttp
+import zstandard
+
+from bill_cache import TTLCache
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Tags whose content is not text
+SKIPPED_TAGS = {"script", "style", "head", "title"}
+
+# Tags that start a new line
+BLOCK_TAGS = {
+    "p", "div", "br", "pre", "li", "tr", "table", "section", "h1", "h2", "h3",
+    "h4", "h5", "h6", "blockquote", "ul", "ol", "dd", "dt", "hr"
+}
+
+
+class TextExtractor(HTMLParser):
+    """Collects the visible text of an HTML document, keeping line structure"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Strip tags, scripts and styles; collapse runs of spaces and blank lines"""
+    extractor = TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    text = "".join(extractor.parts)
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in text.split("\n"))
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+@dataclass
+class BillText:
+    url: str
+    text: str
+    sha256: str
+
+
+class BillTextStore:
+    def __init__(self, root: str = os.path.join("bin", "bill_text"), memory_entries: int = 64,
+                 compression_level: int = 10, ssl=None):
+        """
+        Args:
+            root: Directory of the compressed texts
+            memory_entries: Recently used texts also kept decompressed in memory
+            compression_level: zstd level
+            ssl: SSL context (or False) passed to aiohttp for downloads
+        """
+        self.root = root
+        self.memory = TTLCache(max_entries=memory_entries, ttl=3600)
+        self.downloads = SingleFlight()  # In-process coalescing only
+        self.compression_level = compression_level
+        self.ssl = ssl
+        self.session = None  # Shared aiohttp session set by the app lifespan
+        self.fetches = 0
+        self.disk_hits = 0
+
+    @classmethod
+    def from_env(cls, ssl=None) -> "BillTextStore":
+        return cls(
+            root=os.getenv("BILL_TEXT_PATH", os.path.join("bin", "bill_text")),
+            memory_entries=int(os.getenv("BILL_TEXT_MEMORY_ENTRIES", "64")),
+            ssl=ssl
+        )
+
+    @staticmethod
+    def version_key(url: str) -> str:
+        """File-safe key of a text version: its file name plus a hash of the full URL"""
+        name = os.path.splitext(os.path.basename(url.split("?")[0]))[0]
+        name = re.sub(r"[^A-Za-z0-9_-]", "", name)[:80] or "text"
+        return f"{name}-{hashlib.sha256(url.encode()).hexdigest()[:12]}"
+
+    def _paths(self, url: str):
+        key = self.version_key(url)
+        base = os.path.join(self.root, key[-2:], key)
+        return base + ".txt.zst", base + ".json"
+
+    async def get(self, url: str) -> BillText:
+        """Clean text of the version at `url`, downloading it on first use"""
+        cached = self.memory.get(url)
+        if cached is not None:
+            return cached
+        bill_text = await self.downloads.do(f"text:{url}", lambda: self._load(url))
+        self.memory.set(url, bill_text)
+        return bill_text
+
+    async def get_text(self, url: str) -> str:
+        return (await self.get(url)).text
+
+    async def _load(self, url: str) -> BillText:
+        stored = await asyncio.to_thread(self._read, url)
+        if stored is not None:
+            self.disk_hits += 1
+            return stored
+
+        html = await self._download(url)
+        text = await asyncio.to_thread(html_to_text, html)
+        bill_text = BillText(url, text, hashlib.sha256(text.encode()).hexdigest())
+        await asyncio.to_thread(self._write, bill_text, len(html.encode()))
+        logger.info(f"Stored bill text {url} ({len(html)} chars of HTML, {len(text)} of text)")
+        return bill_text
+
+    async def _download(self, url: str) -> str:
+        self.fetches += 1
+        if self.session is not None:
+            async with self.session.get(url, ssl=self.ssl) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"Failed to fetch bill text. Status: {response.status}")
+                return await response.text()
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, ssl=self.ssl) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"Failed to fetch bill text. Status: {response.status}")
+                return await response.text()
+
+    def _read(self, url: str) -> Optional[BillText]:
+        text_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(text_path, "rb") as f:
+                text = zstandard.ZstdDecompressor().decompress(f.read()).decode()
+        except FileNotFoundError:
+            return None
+        return BillText(url, text, meta["sha256"])
+
+    def _write(self, bill_text: BillText, html_bytes: int):
+        text_path, meta_path = self._paths(bill_text.url)
+        compressed = zstandard.ZstdCompressor(level=self.compression_level).compress(bill_text.text.encode())
+        meta = {
+            "url": bill_text.url,
+            "sha256": bill_text.sha256,
+            "html_bytes": html_bytes,
+            "text_chars": len(bill_text.text),
+            "compressed_bytes": len(compressed),
+            "fetched_at": datetime.utcnow().isoformat()
+        }
+        # Text first, metadata last: a version counts as stored once its metadata exists
+        atomic_write(text_path, compressed)
+        atomic_write(meta_path, json.dumps(meta).encode())
+
+    def stats(self) -> dict:
+        return {"fetches": self.fetches, "disk_hits": self.disk_hits, "memory": self.memory.stats()}
+
+
+def atomic_write(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for Grok completions.
+
+    Responses are keyed on a hash of everything that determines the output
+    (model, messages, temperature, max_tokens). Lookups go through a small
+    in-memory LRU first and then an on-disk tier shared by all workers on the
+    host. Both tiers expire entries after `ttl` seconds; the memory tier is
+    bounded by entry count and the disk tier by total bytes. Disk entries
+    keep their write time as mtime (for expiry) and are marked on every hit
+    through their atime, so the disk tier evicts least recently used first.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 7 * 24 * 3600,
+                 disk_path: Optional[str] = None, max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            ttl: Seconds before a cached response expires
+            disk_path: Directory for the on-disk tier (None disables it)
+            max_disk_bytes: Size limit of the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0,
+                       "memory_evictions": 0, "disk_evictions": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build the cache from GROK_CACHE_* environment variables, or None if disabled"""
+        if os.getenv("GROK_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+        return cls(
+            max_entries=int(os.getenv("GROK_CACHE_MAX_ENTRIES", "1024")),
+            ttl=float(os.getenv("GROK_CACHE_TTL", str(7 * 24 * 3600))),
+            disk_path=os.getenv("GROK_CACHE_PATH", os.path.join("bin", "grok_cache")) or None,
+            max_disk_bytes=int(os.getenv("GROK_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        )
+
+    @staticmethod
+    def make_key(model: str, messages: list, temperature: float, max_tokens: int) -> str:
+        """Hash the request parameters that determine the completion"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            created, value = entry
+            if time.time() - created < self.ttl:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return value
+            del self._memory[key]
+
+        if self.disk_path:
+            entry = await asyncio.to_thread(self._disk_get, key)
+            if entry is not None:
+                self._remember(key, entry)
+                self._stats["disk_hits"] += 1
+                return entry[1]
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """Store a response in both tiers"""
+        entry = (time.time(), value)
+        self._remember(key, entry)
+        self._stats["writes"] += 1
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_set, key, entry)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes"""
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        return {
+            **self._stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    # On-disk tier (runs in worker threads)
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, key[:2], f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        path = self._disk_file(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - data["created"] >= self.ttl:
+            self._disk_remove(path)
+            return None
+        self._touch(path)
+        return data["created"], data["value"]
+
+    @staticmethod
+    def _touch(path: str):
+        """Record a hit in the file's atime, keeping its mtime (the write time)"""
+        try:
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except OSError:
+            pass
+
+    def _disk_set(self, key: str, entry: tuple):
+        path = self._disk_file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        body = json.dumps({"created": entry[0], "value": entry[1]}, ensure_ascii=False).encode("utf-8")
+
+        # Write to a temp file and rename so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(body) - replaced
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+
+    def _entries(self):
+        for root, _, files in os.walk(self.disk_path):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_atime, stat.st_size
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, _, _, size in self._entries())
+
+    def _evict_disk(self):
+        """Drop expired entries, then the least recently used ones, until the tier is back under 90% of its limit"""
+        now = time.time()
+        # Expired entries first, then by last use
+        entries = sorted(self._entries(), key=lambda e: (now - e[1] < self.ttl, e[2]))
+        total = sum(size for _, _, _, size in entries)
+        target = self.max_disk_bytes * 0.9
+
+        for path, mtime, _, size in entries:
+            if total <= target and now - mtime < self.ttl:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self._stats["disk_evictions"] += 1
+
+        self._disk_bytes = total
@@ -1,9 +1,15 @@
 import os
-from typing import Optional
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 
+from .cache import ResponseCache
+from .context import count_tokens, split_to_budget
+
 # Load environment variables
 load_dotenv()
 
@@ -27,7 +33,7 @@ class GrokClient:
             ValueError: If GROK_API_KEY environment variable is not set
         """
         self.api_key = os.getenv("GROK_API_KEY")
-        self.base_url = "https://api.x.ai/v1/chat/completions"
+        self.base_url = os.getenv("GROK_API_URL", "https://api.x.ai/v1/chat/completions")
         
         if not self.api_key:
             raise ValueError("GROK API key not configured")
@@ -36,14 +42,44 @@ class GrokClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.model = "grok-beta"
+        self.timeout = float(os.getenv("GROK_TIMEOUT", "30"))
+
+        # Shared, connection-pooled client set by the app lifespan; when it
+        # is not set (scripts, tests) a short-lived client is used instead
+        self.http_client: Optional[httpx.AsyncClient] = None
+
+        # Identical prompts (summaries, analyses) are served from the cache.
+        # Sampling at high temperature is meant to vary, so it is not cached
+        # unless GROK_CACHE_MAX_TEMPERATURE is raised.
+        self.cache = ResponseCache.from_env()
+        self.cache_max_temperature = float(os.getenv("GROK_CACHE_MAX_TEMPERATURE", "0.5"))
+
+        # Bills longer than summary_input_tokens are summarized map-reduce
+        # style: sections of summary_section_tokens are condensed in parallel
+        # and the summary is written from the condensed sections
+        self.summary_input_tokens = int(os.getenv("GROK_SUMMARY_INPUT_TOKENS", "24000"))
+        self.summary_section_tokens = int(os.getenv("GROK_SUMMARY_SECTION_TOKENS", "8000"))
+        self.summary_concurrency = int(os.getenv("GROK_SUMMARY_CONCURRENCY", "4"))
     
-    async def _make_request(self, messages: list, temperature: float = 0.3, max_tokens: int = 500) -> str:
+    @asynccontextmanager
+    async def _client(self):
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+
+    async def _make_request(self, messages: list, temperature: float = 0.3, max_tokens: int = 500,
+                            use_cache: bool = True) -> str:
         """
         Make a request to the XAI (Grok) API.
         
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Controls randomness in the response (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            use_cache: Whether the response may be served from / stored in the cache
             
         Returns:
             str: The generated response text
@@ -51,19 +87,26 @@ class GrokClient:
         Raises:
             HTTPException: If the API request fails or times out
         """
+        cache_key = None
+        if self.cache is not None and use_cache and temperature <= self.cache_max_temperature:
+            cache_key = ResponseCache.make_key(self.model, messages, temperature, max_tokens)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(
                     self.base_url,
                     headers=self.headers,
                     json={
-                        "model": "grok-beta",
+                        "model": self.model,
                         "messages": messages,
                         "temperature": temperature,
                         "stream": False,
                         "max_tokens": max_tokens
                     },
-                    timeout=30.0
+                    timeout=self.timeout
                 )
                 
                 if response.status_code != 200:
@@ -73,12 +116,76 @@ class GrokClient:
                     )
                     
                 result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+                content = result["choices"][0]["message"]["content"].strip()
                 
         except httpx.TimeoutException:
             raise HTTPException(status_code=504, detail="GROK API request timed out")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error calling GROK API: {str(e)}")
+
+        if cache_key is not None:
+            try:
+                await self.cache.set(cache_key, content)
+            except OSError:
+                pass  # A failed cache write should never fail the request
+        return content
+    
+    async def _stream_request(self, messages: list, temperature: float = 0.3,
+                              max_tokens: int = 500) -> AsyncIterator[str]:
+        """
+        Make a streaming request to the XAI (Grok) API.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness in the response (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            str: Pieces of the generated response text as they arrive
+            
+        Raises:
+            HTTPException: If the API request fails or times out
+        """
+        try:
+            async with self._client() as client:
+                async with client.stream(
+                    "POST",
+                    self.base_url,
+                    headers=self.headers,
+                    json={
+                        "model": self.model,
+                        "messages": messages,
+                        "temperature": temperature,
+                        "stream": True,
+                        "max_tokens": max_tokens
+                    },
+                    timeout=self.timeout
+                ) as response:
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        raise HTTPException(
+                            status_code=500,
+                            detail=f"GROK API error: {body.decode(errors='replace')}"
+                        )
+
+                    # The API streams Server-Sent Events: "data: {json}" lines
+                    # terminated by "data: [DONE]"
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                        if delta:
+                            yield delta
+
+        except HTTPException:
+            raise
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=504, detail="GROK API request timed out")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error calling GROK API: {str(e)}")
     
     async def get_bill_summary(self, bill_text: str) -> str:
         """
@@ -86,6 +193,7 @@ class GrokClient:
         
         This method uses the Grok model to create a brief, focused summary
         of the bill's main purpose and key provisions, limited to 2-3 sentences.
+        Bills too long for one prompt are condensed section by section first.
         
         Args:
             bill_text: The full text content of the bill
@@ -96,6 +204,9 @@ class GrokClient:
         Raises:
             HTTPException: If the API request fails
         """
+        if await asyncio.to_thread(count_tokens, bill_text) > self.summary_input_tokens:
+            bill_text = await self._condense_bill(bill_text)
+
         prompt = f"""Provide a brief, one-paragraph summary of this bill's main purpose and key provisions. Be extremely concise and focus only on the most important points:
 
 {bill_text}
@@ -112,6 +223,44 @@ Summary:"""
         
         return await self._make_request(messages, temperature=0.3)
     
+    async def _condense_bill(self, bill_text: str, max_rounds: int = 3) -> str:
+        """
+        Map step of the summary: replace the text by summaries of its sections,
+        summarized in parallel, until it fits in summary_input_tokens.
+        
+        Args:
+            bill_text: The full text content of the bill
+            max_rounds: Passes over ever shorter notes before truncating
+            
+        Returns:
+            str: Section summaries in document order
+        """
+        semaphore = asyncio.Semaphore(self.summary_concurrency)
+
+        async def summarize_section(section: str, number: int, total: int) -> str:
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are a legislative assistant condensing one part of a long bill. Keep every substantive provision, amount, date and affected party; drop boilerplate."
+                },
+                {
+                    "role": "user",
+                    "content": f"Summarize part {number} of {total} of this bill in a short paragraph:\n\n{section}\n\nSummary:"
+                }
+            ]
+            async with semaphore:
+                return await self._make_request(messages, temperature=0.3, max_tokens=400)
+
+        for _ in range(max_rounds):
+            sections = await asyncio.to_thread(split_to_budget, bill_text, self.summary_section_tokens)
+            notes = await asyncio.gather(*(
+                summarize_section(section, i + 1, len(sections)) for i, section in enumerate(sections)
+            ))
+            bill_text = "\n\n".join(notes)
+            if count_tokens(bill_text) <= self.summary_input_tokens:
+                return bill_text
+        return split_to_budget(bill_text, self.summary_input_tokens)[0]
+
     async def analyze_bill(self, bill_text: str, analysis_type: str) -> str:
         """
         Analyze a bill based on the specified analysis type.
@@ -154,26 +303,59 @@ Analysis:"""
             HTTPException: If the API request fails
         """
         try:
+            messages = self._chat_messages(question, bill_title)
+            return await self._make_request(messages, temperature=1, max_tokens=2000)
 
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are Grok, a chatbot with vast knowledge of all Congress bills, with real time updates of the latest events.
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error calling Grok API: {str(e)}")
+
+    async def chat_about_bill_stream(self, question: str, bill_title: str = None) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat_about_bill.
+        
+        Args:
+            question: The user's question or message
+            bill_title: The title of the bill
+            
+        Yields:
+            str: Pieces of the AI's response as they are generated
+            
+        Raises:
+            HTTPException: If the API request fails
+        """
+        messages = self._chat_messages(question, bill_title)
+        async for delta in self._stream_request(messages, temperature=1, max_tokens=2000):
+            yield delta
+
+    @staticmethod
+    def _chat_messages(question: str, bill_title: str = None) -> list:
+        return [
+            {
+                "role": "system",
+                "content": """You are Grok, a chatbot with vast knowledge of all Congress bills, with real time updates of the latest events.
                     Your answers are to be concise and to the point.
                     Your answers should be authoritative and factual, yet not boring or dry. Try to make them interesting and engaging.
                     When the bill doesn't contain information about the specific question, you should just use your knowledge to answer the question.
                     Strive for your answers to contain up to date info and if possible make them interesting and engaging."""
-                },
-                {
-                    "role": "user",
-                    "content": f"{bill_title}. {question}"
-                }
-            ]
-            
-            return await self._make_request(messages, temperature=1, max_tokens=2000)
+            },
+            {
+                "role": "user",
+                "content": f"{bill_title}. {question}"
+            }
+        ]
+
+# Shared instance, created on first use so importing this module never fails
+_grok_client: Optional[GrokClient] = None
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error calling Grok API: {str(e)}")
 
-# Create a singleton instance
-grok_client = GrokClient()
+def get_grok_client() -> GrokClient:
+    """
+    Return the shared GrokClient, creating it on first call.
+
+    Raises:
+        ValueError: If GROK_API_KEY environment variable is not set
+    """
+    global _grok_client
+    if _grok_client is None:
+        _grok_client = GrokClient()
+    return _grok_client
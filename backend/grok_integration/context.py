@@ -0,0 +1,162 @@
+"""
+Token-budget-aware prompt assembly.
+
+Retrieved chunks overlap (the splitter repeats the last ~50 characters of a
+chunk at the start of the next) and can add up to more than the model
+should see. build_context drops duplicates and overlaps, keeps the best
+ranked chunks that fit a token budget and lays them out in document order.
+split_to_budget cuts long texts into pieces of at most a given number of
+tokens, for map-reduce summarization of large bills.
+"""
+
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tokens of retrieved bill text included in a chat prompt
+CONTEXT_TOKEN_BUDGET = int(os.getenv("GROK_CONTEXT_TOKENS", "6000"))
+
+# Longest overlap stripped between consecutive chunks (the splitter uses 50)
+MAX_OVERLAP_CHARS = 200
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """tiktoken's cl100k_base, or None if it is not installed or cannot be loaded"""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(os.getenv("TOKEN_ENCODING", "cl100k_base"))
+        except Exception as e:
+            # The encoding is downloaded on first use; offline, estimate instead
+            logger.warning(f"tiktoken unavailable, estimating token counts: {str(e)}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in `text`; about four characters per token without tiktoken"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def strip_overlap(previous: str, text: str) -> str:
+    """Remove the start of `text` that repeats the end of `previous`"""
+    limit = min(len(previous), len(text), MAX_OVERLAP_CHARS)
+    for size in range(limit, 0, -1):
+        if previous.endswith(text[:size]):
+            return text[size:].lstrip()
+    return text
+
+
+def build_context(chunks: List[Dict], budget: int = CONTEXT_TOKEN_BUDGET) -> Optional[str]:
+    """
+    Assemble retrieved chunks into a prompt context of at most `budget` tokens.
+
+    Args:
+        chunks: Dicts with "text" and optionally "chunk_id" and "score", best
+            match first (the order Pinecone returns them in)
+        budget: Maximum number of tokens of the result
+
+    Returns:
+        The selected chunks in document order, adjacent chunks merged, or
+        None if there is nothing to include
+    """
+    seen = set()
+    selected = []
+    used = 0
+    for rank, chunk in enumerate(chunks):
+        text = (chunk.get("text") or "").strip()
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        tokens = count_tokens(text)
+        if used + tokens > budget:
+            continue  # A shorter, lower ranked chunk may still fit
+        used += tokens
+        chunk_id = chunk.get("chunk_id")
+        # Pinecone returns numeric metadata as floats
+        selected.append((int(chunk_id) if chunk_id is not None else rank, text))
+
+    if not selected:
+        return None
+
+    # Document order reads better and lets neighbouring chunks be joined
+    selected.sort(key=lambda item: item[0])
+    parts = []
+    previous_id = previous_text = None
+    for chunk_id, text in selected:
+        if previous_id is not None and chunk_id == previous_id + 1:
+            parts[-1] += " " + strip_overlap(previous_text, text)
+        else:
+            parts.append(text)
+        previous_id, previous_text = chunk_id, text
+    return "\n\n".join(parts)
+
+
+def split_to_budget(text: str, budget: int) -> List[str]:
+    """
+    Split `text` into pieces of at most `budget` tokens, cutting at
+    paragraph boundaries where possible, then at lines, then anywhere.
+    """
+    if count_tokens(text) <= budget:
+        return [text]
+
+    pieces = []
+    current = []
+    current_tokens = 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        tokens = count_tokens(paragraph)
+        if tokens > budget:
+            # One huge paragraph: split it by lines, or hard-split by size
+            lines = paragraph.split("\n")
+            parts = split_lines(lines, budget) if len(lines) > 1 else hard_split(paragraph, budget)
+        else:
+            parts = [paragraph]
+        for part in parts:
+            part_tokens = count_tokens(part)
+            if current and current_tokens + part_tokens > budget:
+                pieces.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        pieces.append("\n\n".join(current))
+    return pieces
+
+
+def split_lines(lines: List[str], budget: int) -> List[str]:
+    parts = []
+    current = []
+    current_tokens = 0
+    for line in lines:
+        tokens = count_tokens(line)
+        if tokens > budget:
+            if current:
+                parts.append("\n".join(current))
+                current, current_tokens = [], 0
+            parts.extend(hard_split(line, budget))
+            continue
+        if current and current_tokens + tokens > budget:
+            parts.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def hard_split(text: str, budget: int) -> List[str]:
+    """Split by character count, sized from the text's tokens per character"""
+    tokens = max(count_tokens(text), 1)
+    size = max(1, int(len(text) * budget / tokens * 0.9))
+    return [text[i:i + size] for i in range(0, len(text), size)]
@@ -0,0 +1,67 @@
+import os
+import logging
+
+import aiohttp
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClients:
+    """
+    Application-scoped, connection-pooled HTTP clients.
+
+    Created once in the FastAPI lifespan and shared by every request so
+    connections (and their TCP/TLS handshakes) are reused via keep-alive:
+    - httpx_client: Grok API calls, negotiates HTTP/2 when the host supports it
+    - aiohttp_session: bill text and PDF downloads from congress.gov/govinfo, with a
+      per-host connection limit
+    """
+
+    httpx_client: httpx.AsyncClient = None
+    aiohttp_session: aiohttp.ClientSession = None
+
+    async def start(self):
+        connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+        read_timeout = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+        max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+        max_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+        keepalive = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        http2 = HTTP2_AVAILABLE and os.getenv("HTTP2_ENABLED", "true").lower() not in ("0", "false", "no")
+
+        self.httpx_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_per_host,
+                keepalive_expiry=keepalive
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+        self.aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=max_connections,
+                limit_per_host=max_per_host,
+                keepalive_timeout=keepalive,
+                ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=read_timeout, connect=connect_timeout)
+        )
+        logger.info(f"HTTP client pools started (http2={http2})")
+
+    async def close(self):
+        if self.httpx_client is not None:
+            await self.httpx_client.aclose()
+            self.httpx_client = None
+        if self.aiohttp_session is not None:
+            await self.aiohttp_session.close()
+            self.aiohttp_session = None
+
+
+http_clients = HttpClients()
@@ -1,19 +1,34 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from contextlib import asynccontextmanager
 from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
 import os
+import json
+import asyncio
+import threading
 from dotenv import load_dotenv
-import aiohttp
-from pinecone_integration import PineconeClient
-from grok_integration.client import grok_client
+from grok_integration.client import get_grok_client
+from grok_integration.context import build_context
+from http_clients import http_clients
+from singleflight import SingleFlight
+from pipeline import BillPipeline
+import bill_search
+from trending import TrendingEngine
+from bill_cache import BillCache, conditional_response
+from pdf_cache import PdfCache
+from bill_text import BillTextStore
+from semantic_search import SemanticSearch, SemanticSearchResponse
+from bill_listing import (
+    BillListItem, LIST_PROJECTION, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER,
+    ensure_list_indexes, list_response, page_query, split_page
+)
 import ssl
 import logging
 
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse, Response
 
 
 # Load environment variables
@@ -30,6 +45,31 @@ class Database:
 
 db = Database()
 
+# Coalesces concurrent summary generation and vectorization per bill
+singleflight = SingleFlight()
+
+# Trending bills snapshot and hot bill cache, created once the database is connected
+trending: TrendingEngine = None
+bill_cache: BillCache = None
+
+# Downloaded bill PDFs under bin/
+pdf_cache = PdfCache.from_env()
+
+# SSL context that ignores verification, used for bill text downloads
+INSECURE_SSL_CONTEXT = ssl.create_default_context()
+INSECURE_SSL_CONTEXT.check_hostname = False
+INSECURE_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# Clean bill texts, downloaded once per text version
+bill_text_store = BillTextStore.from_env(ssl=INSECURE_SSL_CONTEXT)
+
+# The vector index client connects to Pinecone when it is created, so it is
+# built on first use (or by the warm-up task started in lifespan) rather than
+# at import; semantic search depends on it
+_pinecone_client = None
+_pinecone_lock = threading.Lock()
+_semantic_search: SemanticSearch = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,7 +80,62 @@ async def lifespan(app: FastAPI):
     db.client = AsyncIOMotorClient(MONGO_URL)
     db.db = db.client[DB_NAME]
     logger.info("Connected to the database")
+    await singleflight.setup(db.db.leases)
+    await ensure_list_indexes(db.db.bills)
+    # Index builds can take minutes on a full collection; do not block startup on them
+    search_setup = asyncio.create_task(bill_search.prepare_search(db.db.bills))
+
+    global trending, bill_cache
+    bill_cache = BillCache.from_env(db.db.bills)
+    if os.getenv("BILL_CACHE_WATCH", "false").lower() in ("1", "true", "yes"):
+        bill_cache.start_watching()
+    trending = TrendingEngine.from_env(db.db)
+    await trending.setup()
+    trending.start()
+
+    # Shared connection pools for Grok, bill text and PDF downloads
+    await http_clients.start()
+    try:
+        get_grok_client().http_client = http_clients.httpx_client
+    except ValueError as e:
+        logger.warning(f"Grok client unavailable: {str(e)}")
+    if _pinecone_client is not None:
+        _pinecone_client.session = http_clients.aiohttp_session
+    bill_text_store.session = http_clients.aiohttp_session
+
+    # Connect to the vector index without holding up startup; /readyz
+    # reports ready once it is connected
+    warmup = asyncio.create_task(warm_up_vector_index())
+
+    # Precompute summaries and vectors for newly scraped bills in the background
+    pipeline = None
+    # Opt-in per process (e.g. one worker or a dedicated instance), so every
+    # API worker does not poll for work
+    if os.getenv("PIPELINE_ENABLED", "false").lower() in ("1", "true", "yes"):
+        pipeline = BillPipeline(
+            db.db.bills,
+            summarize=summarize_bill,
+            vectorize=vectorize_bill_once,
+            concurrency=int(os.getenv("PIPELINE_CONCURRENCY", "2")),
+            rate_per_minute=float(os.getenv("PIPELINE_RATE_PER_MINUTE", "30"))
+        )
+        await pipeline.setup()
+        pipeline.start()
     yield
+    search_setup.cancel()
+    warmup.cancel()
+    await trending.stop()
+    await bill_cache.stop_watching()
+    if pipeline:
+        await pipeline.stop()
+    try:
+        get_grok_client().http_client = None
+    except ValueError:
+        pass
+    if _pinecone_client is not None:
+        _pinecone_client.session = None
+    bill_text_store.session = None
+    await http_clients.close()
     if db.client:
         db.client.close()
     logger.info("Shutdown complete")
@@ -64,6 +159,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 class ChatMessage(BaseModel):
@@ -71,6 +167,7 @@ class ChatMessage(BaseModel):
     bill_id: str
     bill_type: str
     congress: str
+    stream: bool = False  # Relay the answer as Server-Sent Events
 
 class BillResponse(BaseModel):
     id: str
@@ -97,6 +194,12 @@ class BillResponse(BaseModel):
             data['pdf_link'] = self._process_pdf_link(data['pdf_link'])
         super().__init__(**data)
 
+def first_link(value) -> Optional[str]:
+    """The scraper stores text/PDF links either as a single URL or a list of URLs"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value or None
+
 class BillSummaryResponse(BaseModel):
     bill_id: str
     summary: str
@@ -105,82 +208,141 @@ class BillSummaryResponse(BaseModel):
 class CrossBillQuery(BaseModel):
     message: str
     chat_history: Optional[List] = None
-
-# Initialize Pinecone client
-pinecone_client = PineconeClient()
+    congress: Optional[int] = None
+    bill_type: Optional[str] = None
+    limit: int = Field(10, ge=1, le=50)
+
+def get_pinecone_client():
+    """Return the shared PineconeClient, creating it on first call (blocking)"""
+    global _pinecone_client
+    with _pinecone_lock:
+        if _pinecone_client is None:
+            # Imported here: the SDK and embedder are slow to import
+            from pinecone_integration import PineconeClient
+            client = PineconeClient()
+            client.session = http_clients.aiohttp_session
+            _pinecone_client = client
+        return _pinecone_client
+
+async def pinecone():
+    """The shared PineconeClient, created off the event loop if needed"""
+    if _pinecone_client is not None:
+        return _pinecone_client
+    return await asyncio.to_thread(get_pinecone_client)
+
+async def get_semantic_search() -> SemanticSearch:
+    """Ranked bills for free-text questions, with a cache of popular queries"""
+    global _semantic_search
+    client = await pinecone()
+    if _semantic_search is None:
+        _semantic_search = SemanticSearch.from_env(client)
+    return _semantic_search
+
+async def warm_up_vector_index():
+    """Create the vector index client in the background, retrying until it connects"""
+    delay = 1
+    while True:
+        try:
+            await pinecone()
+            logger.info("Vector index client ready")
+            return
+        except Exception as e:
+            logger.warning(f"Vector index not available yet, retrying in {delay}s: {str(e)}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+async def stream_chat_events(grok_client, question: str, bill_title: str, context: Optional[str]):
+    """
+    Stream a chat answer as Server-Sent Events.
+
+    Emits a `context` event with the retrieved bill context, one unnamed event
+    per generated text delta ({"delta": ...}), and a final `done` event (or an
+    `error` event if generation fails part-way).
+    """
+    yield sse_event({"context": context}, event="context")
+    try:
+        async for delta in grok_client.chat_about_bill_stream(question=question, bill_title=bill_title):
+            yield sse_event({"delta": delta})
+    except HTTPException as e:
+        yield sse_event({"detail": e.detail}, event="error")
+        return
+    yield sse_event({}, event="done")
 
 @app.post("/api/chat")
 async def chat(message: ChatMessage):
     try:
-        # Get bill from database using all identifiers
-        bill = await db.db.bills.find_one({
-            "number": message.bill_id,
-            "type": message.bill_type.upper(),  # Changed from bill_type to type and ensure uppercase
-            "congress": int(message.congress)
-        })
-        if not bill:
+        grok_client = get_grok_client()
+
+        # Get bill using all identifiers
+        entry = await bill_cache.get(message.congress, message.bill_type, message.bill_id)
+        if not entry:
             raise HTTPException(status_code=404, detail="Bill not found")
+        bill = entry.doc
+        trending.record(bill["congress"], bill["type"], bill["number"], "chats")
+
+        # Bills are normally vectorized ahead of time by the pipeline; vectorize
+        # on first use otherwise. The flag on the bill document lets us skip
+        # the check entirely
+        if not bill.get("vectorized"):
+            await vectorize_bill_once(bill)
+
+        # Get relevant context from this bill only
+        pinecone_client = await pinecone()
+        context_response = await pinecone_client.get_relevant_context(
+            message.message,
+            bill_id=bill["number"],
+            bill_type=bill["type"],
+            congress=bill["congress"]
+        )
 
-        # Try to get relevant context from Pinecone first
-        context_response = await pinecone_client.get_relevant_context(message.message)
-        
-        # If no context found, vectorize the bill and try again
-        if not context_response.get("context"):
-            print(f"No context found for bill {message.bill_id}, vectorizing now...")
-            text_url = bill.get("text_link")
-            if not text_url or not text_url[0]:
-                raise HTTPException(status_code=400, detail="Bill text URL not found")
-
-            success = await pinecone_client.create_vectordb_from_url(
-                url=text_url[0],
-                metadata={
-                    "bill_id": message.bill_id,
-                    "title": bill.get("title"),
-                    "congress": bill.get("congress"),
-                    "bill_type": bill.get("type")
-                }
-            )
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to vectorize bill content")
-            
-            # Try getting context again after vectorization
-            context_response = await pinecone_client.get_relevant_context(message.message)
+        # Deduplicated best chunks, trimmed to the prompt's token budget
+        context = await asyncio.to_thread(build_context, context_response.get("chunks", []))
 
         # Format the question with context if available
-        if context_response.get("context"):
+        if context:
             enhanced_question = f"""Here's a question about bill {message.bill_id} - {bill.get('title', '')}:
 {message.message}
 
 Here's some relevant context from the bill:
-{context_response["context"]}
+{context}
 
 Please provide a detailed answer based on this context."""
         else:
             enhanced_question = message.message
 
+        bill_title = f'Bill {message.bill_type}.{message.bill_id} - {bill.get("title", "")}'
+
+        # Relay tokens as they are generated instead of waiting for the full answer
+        if message.stream:
+            return StreamingResponse(
+                stream_chat_events(grok_client, enhanced_question, bill_title, context),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
         # Get response from Grok
         grok_response = await grok_client.chat_about_bill(
             question=enhanced_question,
-            bill_title=f'Bill {message.bill_type}.{message.bill_id} - {bill.get("title", "")}'
+            bill_title=bill_title
         )
 
         return {
             "message": grok_response,
-            "context": context_response.get("context")
+            "context": context
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/bills/{congress}/{bill_type}/{bill_id}")
-async def get_bill(congress: int, bill_type: str, bill_id: str):
-    bill_type = bill_type.upper()
-    bill = await db.db.bills.find_one({"congress": congress, "type": bill_type, "number": bill_id})
-    
-    if not bill:
-        raise HTTPException(status_code=404, detail="Bill not found")
-    
+def render_bill(bill: dict) -> dict:
     return BillResponse(
         id=bill["number"],
         title=bill.get("title", ""),
@@ -190,50 +352,94 @@ async def get_bill(congress: int, bill_type: str, bill_id: str):
         congress=bill.get("congress", "Unknown"),
         pdf_link=bill.get("pdf_link", None),
         latest_action=bill.get("latestAction", {})
-    )
+    ).model_dump()
 
-@app.get("/api/summary/{congress}/{bill_type}/{bill_id}")
-async def get_bill_summary(congress: int, bill_type: str, bill_id: str):
+@app.get("/api/bills/{congress}/{bill_type}/{bill_id}", response_model=BillResponse)
+async def get_bill(request: Request, congress: int, bill_type: str, bill_id: str):
+    entry = await bill_cache.get(congress, bill_type, bill_id)
+    
+    if not entry:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    trending.record(congress, bill_type, bill_id, "views")
+    
+    body, etag = entry.render("bill", render_bill)
+    return conditional_response(request, body, etag, entry.last_modified)
+
+@app.get("/api/summary/{congress}/{bill_type}/{bill_id}", response_model=BillSummaryResponse)
+async def get_bill_summary(request: Request, congress: int, bill_type: str, bill_id: str):
     # Check if summary exists in database
-    bill = await db.db.bills.find_one({"congress": congress, "type": bill_type, "number": bill_id})
+    entry = await bill_cache.get(congress, bill_type, bill_id)
     
-    if not bill:
+    if not entry:
         raise HTTPException(status_code=404, detail="Bill not found")
     
     # If summary exists in database, return it
-    if bill.get("summary"):
-        return BillSummaryResponse(bill_id=bill_id, summary=bill["summary"])
+    if entry.doc.get("summary"):
+        body, etag = entry.render(
+            "summary", lambda bill: {"bill_id": bill_id, "summary": bill["summary"]}
+        )
+        return conditional_response(request, body, etag, entry.last_modified)
     
-    # If no summary, call GROK API
+    # If no summary, call GROK API. Concurrent requests for the same bill
+    # (in this worker or others) share a single generation.
+    summary = await summarize_bill(entry.doc)
+    return BillSummaryResponse(bill_id=bill_id, summary=summary)
+
+
+async def summarize_bill(bill: dict) -> str:
+    """Generate a bill's summary once, however many requests/workers ask for it"""
+    return await singleflight.do(
+        f"summary:{bill['congress']}:{bill['type']}:{bill['number']}",
+        lambda: generate_bill_summary(bill),
+        wait_for=lambda: load_bill_field(bill["_id"], "summary")
+    )
+
+
+async def vectorize_bill_once(bill: dict) -> bool:
+    """Vectorize a bill once, however many requests/workers ask for it"""
+    return await singleflight.do(
+        f"vectorize:{bill['congress']}:{bill['type']}:{bill['number']}",
+        lambda: ensure_bill_vectorized(bill),
+        wait_for=lambda: load_bill_field(bill["_id"], "vectorized")
+    )
+
+
+async def load_bill_field(bill_object_id, field: str):
+    """Read one field of a bill, or None if it has not been set (yet)"""
+    bill = await db.db.bills.find_one({"_id": bill_object_id}, {field: 1})
+    return bill.get(field) if bill and bill.get(field) else None
+
+
+async def load_bill_text(text_url: str) -> str:
+    """Clean text of a bill version; a failed download is the caller's 400"""
+    try:
+        return await bill_text_store.get_text(text_url)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def generate_bill_summary(bill: dict) -> str:
+    """Download a bill's text, summarize it with Grok and store the summary"""
     try:
         # Get bill text from the text_link
-        if not bill.get("text_link") or len(bill["text_link"]) == 0:
+        text_url = first_link(bill.get("text_link"))
+        if not text_url:
             raise HTTPException(status_code=400, detail="Bill text link not found")
-            
-        text_url = bill["text_link"][0]
-        
-        # Create SSL context that ignores verification
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
         
-        # Fetch the HTML content with SSL context
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=ssl_context)) as session:
-            async with session.get(text_url) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=400, detail=f"Failed to fetch bill text. Status: {response.status}")
-                bill_text = await response.text()
+        # Clean text from the store; downloaded only the first time
+        bill_text = await load_bill_text(text_url)
             
         # Get summary from GROK
-        summary = await grok_client.get_bill_summary(bill_text)
+        summary = await get_grok_client().get_bill_summary(bill_text)
             
         # Update database with new summary
         await db.db.bills.update_one(
-            {"congress": congress, "type": bill_type, "number": bill_id},
-            {"$set": {"summary": summary}}
+            {"_id": bill["_id"]},
+            {"$set": {"summary": summary, "summary_updated_at": datetime.utcnow()}}
         )
+        bill_cache.invalidate(bill)
         
-        return BillSummaryResponse(bill_id=bill_id, summary=summary)
+        return summary
         
     except HTTPException as he:
         raise
@@ -241,6 +447,37 @@ async def get_bill_summary(congress: int, bill_type: str, bill_id: str):
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
 
 
+async def ensure_bill_vectorized(bill: dict) -> bool:
+    """Vectorize a bill unless it already has vectors, and record the flag (and manifest) on the bill"""
+    update = {"vectorized": True}
+    # With a manifest, re-vectorizing only touches the chunks whose text changed
+    previous = await load_bill_field(bill["_id"], "vector_manifest")
+    pinecone_client = await pinecone()
+    if previous or not await pinecone_client.is_bill_vectorized(bill["number"], bill["type"], bill["congress"]):
+        print(f"Bill {bill['number']} is not vectorized, vectorizing now...")
+        text_url = first_link(bill.get("text_link"))
+        if not text_url:
+            raise HTTPException(status_code=400, detail="Bill text URL not found")
+
+        manifest = await pinecone_client.create_vectordb_from_text(
+            await load_bill_text(text_url),
+            metadata={
+                "bill_id": bill["number"],
+                "title": bill.get("title"),
+                "congress": bill.get("congress"),
+                "bill_type": bill.get("type")
+            },
+            previous=previous
+        )
+        if not manifest:
+            raise HTTPException(status_code=500, detail="Failed to vectorize bill content")
+        update["vector_manifest"] = manifest
+
+    await db.db.bills.update_one({"_id": bill["_id"]}, {"$set": update})
+    bill_cache.invalidate(bill)
+    return True
+
+
 @app.post("/api/bills/{bill_id}/vectorize")
 async def vectorize_bill(bill_id: str):
     try:
@@ -249,147 +486,155 @@ async def vectorize_bill(bill_id: str):
         if not bill:
             raise HTTPException(status_code=404, detail="Bill not found")
             
+        text_url = first_link(bill.get("text_link"))
+        if not text_url:
+            raise HTTPException(status_code=400, detail="Bill text URL not found")
+
         # Create vector embeddings for the bill
-        success = await pinecone_client.create_vectordb_from_url(
-            url=bill.get("text_url"),
+        pinecone_client = await pinecone()
+        manifest = await pinecone_client.create_vectordb_from_text(
+            await load_bill_text(text_url),
             metadata={
                 "bill_id": bill_id,
                 "title": bill.get("title"),
-                "congress": bill.get("congress")
-            }
+                "congress": bill.get("congress"),
+                "bill_type": bill.get("type")
+            },
+            previous=bill.get("vector_manifest")
         )
         
-        if not success:
+        if not manifest:
             raise HTTPException(status_code=500, detail="Failed to create vector embeddings")
+
+        await db.db.bills.update_one(
+            {"_id": bill["_id"]},
+            {"$set": {"vectorized": True, "vector_manifest": manifest}}
+        )
+        bill_cache.invalidate(bill)
             
         return {"message": "Bill vectorized successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/bills")
-async def get_bills_sorted(sort_by: str = "title", order: str = "asc"):
+@app.get("/api/bills", response_model=List[BillListItem], response_class=ORJSONResponse)
+async def get_bills_sorted(sort_by: str = "title", order: str = "asc",
+                           limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None):
+    return await list_bills_page(sort_by, order, limit, cursor)
+
+@app.get("/api/trending-bills", response_model=List[BillListItem])
+async def get_trending_bills():
+    # Precomputed by the trending engine, see trending.py
+    return Response(content=trending.body, media_type="application/json")
+
+async def list_bills_page(sort_by: str, order: str, limit: int, cursor: Optional[str]):
+    """One keyset-paginated page of bills; the next page's cursor goes in X-Next-Cursor"""
     try:
-        # Determine the sort order
-        sort_order = 1 if order == "asc" else -1
-        
-        # Fetch and sort bills from the database
-        bills_cursor = db.db.bills.find().sort(sort_by, sort_order).limit(100)
-        bills = await bills_cursor.to_list(length=100)
-        
-        # Transform the bills into the desired response format
-        bill_responses = [
-            BillResponse(
-                id=bill["number"],
-                title=bill.get("title", ""),
-                summary=bill.get("summary", None),
-                status=bill.get("latestAction", {}).get("text", "Unknown"),
-                type=bill.get("type", "Unknown"),
-                congress=bill.get("congress", "Unknown"),
-                pdf_link=[bill["pdf_link"]] if isinstance(bill.get("pdf_link"), str) else bill.get("pdf_link", None),  # Convert string to list if needed
-                latest_action=bill.get("latestAction", {})
-            )
-            for bill in bills
-        ]
-        
-        return bill_responses
+        query, sort = page_query(sort_by, order, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Fetch one extra row to know whether there is a next page
+        bills_cursor = db.db.bills.find(query, LIST_PROJECTION).sort(sort).limit(limit + 1)
+        bills = await bills_cursor.to_list(length=limit + 1)
+
+        page, next_cursor = split_page(bills, limit, sort_by, order)
+        return list_response(page, next_cursor)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching bills: {str(e)}")
 
-@app.get("/api/trending-bills")
-async def get_trending_bills(sort_by: str = "title", order: str = "desc"):
+@app.get("/api/search", response_model=List[BillListItem], response_class=ORJSONResponse)
+async def search_bills(query: str, mode: str = "text", congress: Optional[int] = None,
+                       bill_type: Optional[str] = None, limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+                       cursor: Optional[str] = None):
+    """
+    Search bills by title, number and summary. mode=prefix matches the last
+    word as a prefix, for typeahead. The next page's cursor goes in X-Next-Cursor.
+    """
     try:
-        # Determine the sort order
-        sort_order = 1 if order == "asc" else -1
-        
-        # Fetch and sort bills from the database
-        bills_cursor = db.db.bills.find().sort(sort_by, sort_order).limit(50)
-        bills = await bills_cursor.to_list(length=50)
-        
-        # Transform the bills into the desired response format
-        bill_responses = [
-            BillResponse(
-                id=bill["number"],
-                title=bill.get("title", ""),
-                summary=bill.get("summary", None),
-                status=bill.get("latestAction", {}).get("text", "Unknown"),
-                type=bill.get("type", "Unknown"),
-                congress=bill.get("congress", "Unknown"),
-                pdf_link=[bill["pdf_link"]] if isinstance(bill.get("pdf_link"), str) else bill.get("pdf_link", None),  # Convert string to list if needed
-                latest_action=bill.get("latestAction", {})
-            )
-            for bill in bills
-        ]
-        
-        return bill_responses
+        bills, next_cursor = await bill_search.search_bills(
+            db.db.bills, query, mode, congress, bill_type, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching bills: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching bills: {str(e)}")
+    return list_response(bills, next_cursor)
 
-@app.get("/api/search")
-async def search_bills_by_title(query: str):
+@app.post("/api/search/semantic", response_model=SemanticSearchResponse)
+async def search_bills_semantic(query: CrossBillQuery):
+    """Bills whose text is closest in meaning to the question, with matching snippets"""
+    if not query.message.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
     try:
-        # Use a case-insensitive regex to search for the title
-        bills_cursor = db.db.bills.find({"title": {"$regex": query, "$options": "i"}})
-        bills = await bills_cursor.to_list(length=20)
-        
-        # Transform the bills into the desired response format
-        bill_responses = [
-            BillResponse(
-                id=bill["number"],
-                title=bill.get("title", ""),
-                summary=bill.get("summary", None),
-                status=bill.get("latestAction", {}).get("text", "Unknown"),
-                type=bill.get("type", "Unknown"),
-                congress=bill.get("congress", "Unknown"),
-                pdf_link=[bill["pdf_link"]] if isinstance(bill.get("pdf_link"), str) else bill.get("pdf_link", None),  # Convert string to list if needed
-                latest_action=bill.get("latestAction", {})
-            )
-            for bill in bills
-        ]
-        
-        return bill_responses
+        semantic_search = await get_semantic_search()
+        results = await semantic_search.search(
+            query.message, congress=query.congress, bill_type=query.bill_type, limit=query.limit
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching bills: {str(e)}")
+    return {"query": query.message, "results": results}
 
 @app.get("/api/bills/{congress}/{bill_type}/{bill_id}/pdf")
-async def get_bill_pdf(congress: int, bill_type: str, bill_id: str):
+async def get_bill_pdf(request: Request, congress: int, bill_type: str, bill_id: str):
     # Construct the file path for the PDF
-    pdf_path = os.path.join("bin", str(congress), bill_type.upper(), bill_id, "bill.pdf")
-    
-    # Check if the PDF file exists locally
-    if os.path.exists(pdf_path):
-        return FileResponse(pdf_path, media_type='application/pdf', filename=f"{bill_id}.pdf")
-    
-    # If PDF not found locally, fetch from database
-    bill = await db.db.bills.find_one({
-        "congress": congress,
-        "type": bill_type.upper(),
-        "number": bill_id
-    })
-    
-    if not bill or not bill.get("pdf_link"):
-        raise HTTPException(status_code=404, detail="PDF link not found in database")
-    
-    pdf_url = bill["pdf_link"][0]  # Assuming first link is the main PDF
+    pdf_path = pdf_cache.path(congress, bill_type, bill_id)
     
+    # If PDF not found locally, fetch its link from the database
+    if not os.path.exists(pdf_path):
+        entry = await bill_cache.get(congress, bill_type, bill_id)
+        if not entry or not entry.doc.get("pdf_link"):
+            raise HTTPException(status_code=404, detail="PDF link not found in database")
+
+        pdf_url = first_link(entry.doc["pdf_link"])  # Assuming first link is the main PDF
+        try:
+            # Stream it into the cache; concurrent requests share the download
+            await pdf_cache.ensure(pdf_path, pdf_url, http_clients.aiohttp_session)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching PDF: {str(e)}")
+
+    return pdf_cache.response(request, pdf_path, f"{bill_id}.pdf")
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-        
-        # Download PDF
-        async with aiohttp.ClientSession() as session:
-            async with session.get(pdf_url) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=response.status, detail="Failed to fetch PDF from source")
-                
-                # Save PDF to local filesystem
-                with open(pdf_path, 'wb') as f:
-                    f.write(await response.read())
-        
-        # Return the newly downloaded PDF
-        return FileResponse(pdf_path, media_type='application/pdf', filename=f"{bill_id}.pdf")
-        
+        grok_cache = get_grok_client().cache
+    except ValueError:
+        grok_cache = None
+    return {
+        "grok": grok_cache.stats() if grok_cache else None,
+        "bills": bill_cache.stats(),
+        "bill_text": bill_text_store.stats(),
+        "semantic_search": _semantic_search.stats() if _semantic_search else None
+    }
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and its event loop is responsive"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: the database answers and the vector index client is connected"""
+    checks = {}
+    try:
+        if db.client is None:
+            raise RuntimeError("not connected")
+        await asyncio.wait_for(db.client.admin.command("ping"), timeout=2)
+        checks["database"] = "ok"
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching PDF: {str(e)}")
+        checks["database"] = f"error: {str(e) or type(e).__name__}"
+    checks["vector_index"] = "ok" if _pinecone_client is not None else "connecting"
+
+    ready = all(status == "ok" for status in checks.values())
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not ready", "checks": checks},
+        status_code=200 if ready else 503
+    )
 
 if __name__ == "__main__":
     import uvicorn
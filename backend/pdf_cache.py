@@ -0,0 +1,227 @@
+"""
+On-disk cache of bill PDFs for /api/bills/{congress}/{bill_type}/{bill_id}/pdf.
+
+Downloads are streamed to a temporary file next to the target and renamed
+into place once complete, so a reader never sees a partial bill.pdf.
+Concurrent requests for a PDF that is not cached yet share one download.
+Cached files are served with ETag/Last-Modified (304 on revalidation) and
+single byte ranges (206), which the PDF viewer uses to load pages lazily.
+The cache is kept under PDF_CACHE_MAX_BYTES by deleting the least recently
+served PDFs.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import tempfile
+import time
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Served files have their access time bumped at most this often (for eviction order)
+TOUCH_INTERVAL = 3600
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class PdfCache:
+    def __init__(self, root: str = "bin", max_bytes: int = 2 * 1024 ** 3):
+        """
+        Args:
+            root: Cache directory; PDFs live at {root}/{congress}/{TYPE}/{number}/bill.pdf
+            max_bytes: Total size of cached PDFs kept after eviction
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.downloads = SingleFlight()  # In-process coalescing only
+        self._evicting = False
+
+    @classmethod
+    def from_env(cls) -> "PdfCache":
+        return cls(
+            root=os.getenv("PDF_CACHE_PATH", "bin"),
+            max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+        )
+
+    def path(self, congress: int, bill_type: str, number: str) -> str:
+        return os.path.join(self.root, str(congress), bill_type.upper(), number, "bill.pdf")
+
+    async def ensure(self, path: str, url: str, session) -> str:
+        """Download `url` to `path` unless it is cached; returns `path`"""
+        if os.path.exists(path):
+            return path
+        await self.downloads.do(f"pdf:{path}", lambda: self._download(path, url, session))
+        return path
+
+    async def _download(self, path: str, url: str, session):
+        if os.path.exists(path):  # Finished while this request was waiting
+            return
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with session.get(url) as response:
+                    if response.status != 200:
+                        raise HTTPException(status_code=502, detail=f"Failed to fetch PDF from source (HTTP {response.status})")
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        logger.info(f"Cached PDF {path}")
+        if not self._evicting:
+            self._evicting = True
+            try:
+                await asyncio.to_thread(self.evict)
+            finally:
+                self._evicting = False
+
+    def evict(self):
+        """Delete the least recently served PDFs until the cache fits in max_bytes"""
+        files = []
+        total = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".pdf"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                logger.info(f"Evicted cached PDF {path}")
+            except OSError:
+                pass
+
+    def response(self, request: Request, path: str, filename: str) -> Response:
+        """Serve a cached PDF with conditional GET and single-range support"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="PDF not found")
+        if time.time() - stat.st_atime > TOUCH_INTERVAL:
+            try:
+                # Mark as recently served; mtime (and so the ETag) is left alone
+                os.utime(path, (time.time(), stat.st_mtime))
+            except OSError:
+                pass
+
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f'inline; filename="{filename}"',
+        }
+
+        if not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        # Multiple ranges are not supported; the whole file is sent instead
+        if range_header and "," not in range_header and (not if_range or if_range == etag):
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        start, end = byte_range or (0, size - 1)
+        headers["Content-Length"] = str(end - start + 1)
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return StreamingResponse(
+            read_file(path, start, end),
+            status_code=206 if byte_range else 200,
+            media_type="application/pdf",
+            headers=headers
+        )
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class RangeNotSatisfiable(ValueError):
+    """A well-formed range that lies entirely past the end of the file"""
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None for a header that is not a valid byte range (other units,
+    garbage, last < first): per RFC 9110 such a Range is ignored and the
+    whole file is sent. Raises RangeNotSatisfiable for a valid range that
+    starts at or past the end of the file (or an empty suffix).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+async def read_file(path: str, start: int, end: int):
+    with open(path, "rb") as f:
+        await asyncio.to_thread(f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
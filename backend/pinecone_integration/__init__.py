@@ -1,3 +1,5 @@
 from .client import PineconeClient
+from .embeddings import BaseEmbedder, HashingEmbedder, get_embedder
+from .local_index import LocalIndex
 
-__all__ = ['PineconeClient']
+__all__ = ['PineconeClient', 'BaseEmbedder', 'HashingEmbedder', 'get_embedder', 'LocalIndex']
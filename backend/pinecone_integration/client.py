@@ -1,96 +1,304 @@
 import os
-from typing import Optional, List, Dict
-from pinecone import Pinecone, ServerlessSpec
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-import requests
+import asyncio
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, Optional, List, Dict, Tuple
+import aiohttp
 import numpy as np
 import logging
 
+from .embeddings import get_embedder
+from .local_index import LocalIndex
+
 logger = logging.getLogger(__name__)
 
+# Vector ids per fetch request; ids go in the query string, so keep pages small
+FETCH_BATCH_SIZE = 100
+UPSERT_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000  # Pinecone's limit per delete request
+
+# Hex digits of a chunk's SHA-256 used in its vector id
+CHUNK_HASH_CHARS = 16
+
 class PineconeClient:
     def __init__(self):
         # Initialize Pinecone
         try:
-            self.pc = Pinecone(
-                api_key=os.getenv("PINECONE_API_KEY"),
-                environment=os.getenv("PINECONE_ENVIRONMENT", "gcp-starter")
-            )
-            
+            self.embedder = get_embedder()
+
+            # The Pinecone SDK and the embedder are blocking, so they run on a
+            # bounded thread pool instead of the event loop
+            max_workers = int(os.getenv("PINECONE_MAX_WORKERS", "8"))
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pinecone")
+            self._index_semaphore = asyncio.Semaphore(max_workers)
+            self._fetch_semaphore = asyncio.Semaphore(int(os.getenv("BILL_FETCH_CONCURRENCY", "4")))
+
+            # Shared aiohttp session set by the app lifespan (optional)
+            self.session: Optional[aiohttp.ClientSession] = None
+
+            # Bills known to have vectors, keyed on (bill_id, bill_type, congress)
+            self._vectorized = set()
+
             self.index_name = os.getenv("PINECONE_INDEX_NAME", "congress-bills")
-            
-            # Create index if it doesn't exist
-            existing_indexes = [index.name for index in self.pc.list_indexes()]
-            if self.index_name not in existing_indexes:
-                self.pc.create_index(
-                    name=self.index_name,
-                    dimension=3072,  # Using larger dimension
-                    metric='cosine',
-                    spec=ServerlessSpec(
-                        cloud='aws',  # Using AWS for free tier
-                        region='us-east-1'  # Free tier region
-                    )
+            self.backend = os.getenv("VECTOR_BACKEND", "pinecone")
+
+            if self.backend == "local":
+                # In-process index, no Pinecone account or network needed
+                self.index = LocalIndex(
+                    path=os.getenv("LOCAL_INDEX_PATH", os.path.join("bin", "vector_index", self.index_name)),
+                    dimension=self.embedder.dimension,
+                    mode=os.getenv("LOCAL_INDEX_MODE", "auto")
                 )
-            
-            self.index = self.pc.Index(self.index_name)
-            logger.info(f"Successfully initialized Pinecone client with index: {self.index_name}")
+            else:
+                # Imported here so the app (and the local backend) start without the SDK
+                from pinecone import Pinecone, ServerlessSpec
+
+                self.pc = Pinecone(
+                    api_key=os.getenv("PINECONE_API_KEY"),
+                    environment=os.getenv("PINECONE_ENVIRONMENT", "gcp-starter")
+                )
+
+                # Create index if it doesn't exist
+                existing_indexes = [index.name for index in self.pc.list_indexes()]
+                if self.index_name not in existing_indexes:
+                    self.pc.create_index(
+                        name=self.index_name,
+                        dimension=self.embedder.dimension,
+                        metric='cosine',
+                        spec=ServerlessSpec(
+                            cloud='aws',  # Using AWS for free tier
+                            region='us-east-1'  # Free tier region
+                        )
+                    )
+
+                self.index = self.pc.Index(self.index_name)
+
+            logger.info(f"Successfully initialized Pinecone client with {self.backend} index: {self.index_name}")
         
         except Exception as e:
             logger.error(f"Failed to initialize Pinecone client: {str(e)}")
             raise
-    
-    async def create_vectordb_from_url(self, url: str, metadata: Optional[Dict] = None) -> bool:
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking SDK or CPU-bound call on the thread pool"""
+        async with self._index_semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    @staticmethod
+    def _bill_key(bill_id: str, bill_type: str, congress) -> tuple:
+        """Normalize bill identifiers the way they are stored in vector metadata"""
+        return str(bill_id), str(bill_type).upper(), int(congress)
+
+    @classmethod
+    def _bill_filter(cls, bill_id: str = None, bill_type: str = None, congress=None) -> dict:
+        """Build a metadata filter restricting a query to one bill (or a subset of bills)"""
+        clauses = []
+        if bill_id is not None:
+            clauses.append({"bill_id": {"$eq": str(bill_id)}})
+        if bill_type is not None:
+            clauses.append({"bill_type": {"$eq": str(bill_type).upper()}})
+        if congress is not None:
+            clauses.append({"congress": {"$eq": int(congress)}})
+        if not clauses:
+            return {}
+        return {"$and": clauses} if len(clauses) > 1 else clauses[0]
+
+    async def _query(self, **kwargs):
+        """Run an index query off the event loop"""
+        return await self._run_blocking(self.index.query, **kwargs)
+
+    async def _fetch_text(self, url: str) -> str:
+        """Download a bill's text without blocking the event loop"""
+        async with self._fetch_semaphore:
+            if self.session is not None:
+                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    response.raise_for_status()  # Raise exception for bad status codes
+                    return await response.text()
+
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    return await response.text()
+
+    @staticmethod
+    def _split_text(text: str) -> List[str]:
+        """Split text into overlapping chunks (CPU-bound, runs on the thread pool)"""
+        # langchain is slow to import; only vectorization needs it
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=500,
+            chunk_overlap=50
+        )
+        return text_splitter.split_text(text)
+
+    @staticmethod
+    def chunk_hashes(chunks: List[str]) -> List[str]:
+        """Content hash of each chunk; repeated texts get a numeric suffix so hashes stay unique"""
+        seen = {}
+        hashes = []
+        for chunk in chunks:
+            digest = hashlib.sha256(chunk.encode()).hexdigest()[:CHUNK_HASH_CHARS]
+            count = seen.get(digest, 0)
+            seen[digest] = count + 1
+            hashes.append(f"{digest}-{count}" if count else digest)
+        return hashes
+
+    @classmethod
+    def chunk_vector_id(cls, bill_id: str, bill_type: str, congress, chunk_hash: str) -> str:
+        """Vector id of a chunk: the full bill identity plus the chunk's content hash"""
+        bill_id, bill_type, congress = cls._bill_key(bill_id, bill_type, congress)
+        return f"{congress}_{bill_type}_{bill_id}_{chunk_hash}"
+
+    @staticmethod
+    def legacy_chunk_vector_id(bill_id: str, chunk_id: int) -> str:
+        """Positional id used before ids carried the bill identity and a content hash"""
+        return f"{bill_id}_chunk_{chunk_id}"
+
+    async def _legacy_ids_of_bill(self, bill_id: str, bill_type: str, congress: int, chunk_count: int) -> List[str]:
+        """
+        Positional ids {bill_id}_chunk_{i} that currently hold this bill's chunks.
+        Bills with the same number in other congresses or types shared those
+        ids, so ids last written by another bill are left alone.
+        """
+        ids = [self.legacy_chunk_vector_id(bill_id, i) for i in range(chunk_count)]
+        owned = []
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = await self._run_blocking(self.index.fetch, ids=ids[start:start + FETCH_BATCH_SIZE])
+            for vector_id, vector in (response.vectors or {}).items():
+                metadata = vector.metadata or {}
+                try:
+                    key = self._bill_key(metadata.get("bill_id"), metadata.get("bill_type"), metadata.get("congress"))
+                except (TypeError, ValueError):
+                    continue
+                if key == (bill_id, bill_type, congress):
+                    owned.append(vector_id)
+        return owned
+
+    async def create_vectordb_from_url(self, url: str, metadata: Optional[Dict] = None,
+                                       previous: Optional[Dict] = None) -> Optional[Dict]:
         """Create vector embeddings from a bill's text URL"""
         try:
             logger.info(f"Fetching text from URL: {url}")
             # Fetch text from URL
-            response = requests.get(url, timeout=30)  # Add timeout
-            response.raise_for_status()  # Raise exception for bad status codes
-            text = response.text
+            text = await self._fetch_text(url)
             logger.info(f"Successfully fetched text, length: {len(text)}")
-            
-            # Create chunks of text
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=500,
-                chunk_overlap=50
-            )
-            chunks = text_splitter.split_text(text)
-            logger.info(f"Created {len(chunks)} chunks")
-            
+        except Exception as e:
+            logger.error(f"Error creating vector DB: {str(e)}")
+            return None
+        return await self.create_vectordb_from_text(text, metadata, previous)
+
+    async def create_vectordb_from_text(self, text: str, metadata: Optional[Dict] = None,
+                                        previous: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Create or incrementally update the vectors of a bill's (already fetched) text.
+
+        Chunk ids are derived from the chunk's content, so when `previous` (the
+        manifest stored by the last run) is given only new chunks are embedded
+        and upserted, chunks that merely moved get their position updated and
+        chunks no longer in the text are deleted. An unchanged text does no
+        index work at all.
+
+        Args:
+            text: The bill's clean text
+            metadata: bill_id, bill_type, congress and title of the bill
+            previous: The bill's current vector manifest, if any
+
+        Returns:
+            The bill's new vector manifest ({"chunk_count", "ids", "text_sha256",
+            "title", "vectorized_at"}) to store on the bill, or None on failure
+        """
+        try:
+            bill_id, bill_type, congress = self._bill_key(metadata["bill_id"], metadata["bill_type"], metadata["congress"])
+            title = metadata.get("title")
+            text_sha256 = hashlib.sha256(text.encode()).hexdigest()
+            previous = previous or {}
+            previous_ids = previous.get("ids") or []
+
+            if previous_ids and previous.get("text_sha256") == text_sha256 and previous.get("title") == title:
+                logger.info(f"Vectors of bill {congress}/{bill_type}/{bill_id} are up to date")
+                self._vectorized.add((bill_id, bill_type, congress))
+                return previous
+
+            chunks = await self._run_blocking(self._split_text, text)
+            ids = [self.chunk_vector_id(bill_id, bill_type, congress, h) for h in self.chunk_hashes(chunks)]
+
             # Create records for Pinecone
-            vectors = []
-            for i, chunk in enumerate(chunks):
-                # Create a dummy vector (all zeros except one random position)
-                vector = np.zeros(3072)
-                vector[np.random.randint(0, 3072)] = 1
-                
-                vectors.append({
-                    "id": f"{metadata['bill_id']}_chunk_{i}",
-                    "values": vector.tolist(),
-                    "metadata": {
-                        "text": chunk,
-                        "bill_id": metadata.get("bill_id"),
-                        "title": metadata.get("title"),
-                        "congress": metadata.get("congress"),
-                        "bill_type": metadata.get("bill_type"),
-                        "chunk_id": i
+            bill_metadata = {"bill_id": bill_id, "title": title, "congress": congress, "bill_type": bill_type}
+            # Pinecone rejects null metadata values
+            bill_metadata = {k: v for k, v in bill_metadata.items() if v is not None}
+
+            previous_positions = {vector_id: i for i, vector_id in enumerate(previous_ids)}
+            added = [i for i, vector_id in enumerate(ids) if vector_id not in previous_positions]
+            moved = [
+                i for i, vector_id in enumerate(ids)
+                if vector_id in previous_positions
+                and (previous_positions[vector_id] != i or previous.get("title") != title)
+            ]
+            current = set(ids)
+            stale = [vector_id for vector_id in previous_ids if vector_id not in current]
+            if previous.get("chunk_count") and not previous_ids:
+                # Manifest of the positional id scheme
+                stale += await self._legacy_ids_of_bill(bill_id, bill_type, congress, previous["chunk_count"])
+
+            if moved:
+                # chunk_id orders retrieved chunks in chat contexts, so moved chunks
+                # are re-upserted with their stored values: one fetch and one
+                # upsert per batch instead of an update request per chunk
+                for start in range(0, len(moved), UPSERT_BATCH_SIZE):
+                    batch = moved[start:start + UPSERT_BATCH_SIZE]
+                    response = await self._run_blocking(self.index.fetch, ids=[ids[i] for i in batch])
+                    stored = response.vectors or {}
+                    vectors = [
+                        {
+                            "id": ids[i],
+                            "values": list(stored[ids[i]].values),
+                            "metadata": {"text": chunks[i], **bill_metadata, "chunk_id": i}
+                        }
+                        for i in batch if ids[i] in stored
+                    ]
+                    # Chunks missing from the index are embedded again below
+                    added += [i for i in batch if ids[i] not in stored]
+                    if vectors:
+                        await self._run_blocking(self.index.upsert, vectors=vectors)
+
+            # Only new chunks are embedded, in one batch
+            if added:
+                embeddings = await self._run_blocking(self.embedder.embed_documents, [chunks[i] for i in added])
+                vectors = [
+                    {
+                        "id": ids[i],
+                        "values": embedding.tolist(),
+                        "metadata": {"text": chunks[i], **bill_metadata, "chunk_id": i}
                     }
-                })
-            
-            logger.info(f"Created {len(vectors)} vectors")
-            
-            # Upsert in batches of 100
-            batch_size = 100
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                logger.info(f"Upserting batch {i//batch_size + 1} of {(len(vectors) + batch_size - 1)//batch_size}")
-                self.index.upsert(vectors=batch)
-            
-            logger.info("Vectorization completed successfully")
-            return True
+                    for i, embedding in zip(added, embeddings)
+                ]
+                # Upsert in batches, concurrently up to the thread pool limit
+                batches = [vectors[i:i + UPSERT_BATCH_SIZE] for i in range(0, len(vectors), UPSERT_BATCH_SIZE)]
+                await asyncio.gather(*(self._run_blocking(self.index.upsert, vectors=batch) for batch in batches))
+
+            # Stale chunks go last, so readers never see the bill with chunks missing
+            for start in range(0, len(stale), DELETE_BATCH_SIZE):
+                await self._run_blocking(self.index.delete, ids=stale[start:start + DELETE_BATCH_SIZE])
+
+            self._vectorized.add((bill_id, bill_type, congress))
+            logger.info(
+                f"Vectorized bill {congress}/{bill_type}/{bill_id}: {len(chunks)} chunks, "
+                f"{len(added)} embedded, {len(moved)} moved, {len(stale)} deleted"
+            )
+            return {
+                "chunk_count": len(chunks),
+                "ids": ids,
+                "text_sha256": text_sha256,
+                "title": title,
+                "vectorized_at": datetime.utcnow()
+            }
         except Exception as e:
             logger.error(f"Error creating vector DB: {str(e)}")
-            return False
+            return None
     
     async def is_bill_vectorized(self, bill_id: str, bill_type: str, congress: str) -> bool:
         """
@@ -104,21 +312,22 @@ class PineconeClient:
         Returns:
             bool: True if the bill is vectorized, False otherwise
         """
+        key = self._bill_key(bill_id, bill_type, congress)
+        if key in self._vectorized:
+            return True
+
         try:
             # Try to fetch one vector with the bill_id in metadata
-            response = self.index.query(
-                vector=np.zeros(3072).tolist(),  # Dummy vector
-                top_k=25,
-                include_metadata=True,
-                filter={
-                    "$and": [
-                        {"bill_id": bill_id},
-                        {"bill_type": bill_type},
-                        {"congress": congress}
-                    ]
-                }
+            response = await self._query(
+                vector=np.zeros(self.embedder.dimension).tolist(),  # Dummy vector
+                top_k=1,
+                include_metadata=False,
+                filter=self._bill_filter(bill_id, bill_type, congress)
             )
-            return len(response['matches']) > 0
+            if len(response['matches']) > 0:
+                self._vectorized.add(key)
+                return True
+            return False
         except Exception as e:
             logger.error(f"Error checking if bill is vectorized: {str(e)}")
             return False
@@ -127,12 +336,10 @@ class PineconeClient:
         """Query the vector DB about a specific bill using Pinecone's hybrid search"""
         try:
             logger.info("Querying Pinecone...")
-            # Create a dummy query vector (all zeros except one random position)
-            query_vector = np.zeros(3072)
-            query_vector[np.random.randint(0, 3072)] = 1
+            query_vector = await self._run_blocking(self.embedder.embed_query, question)
             
             # Use hybrid search to find relevant chunks
-            query_response = self.index.query(
+            query_response = await self._query(
                 vector=query_vector.tolist(),
                 top_k=25,
                 include_metadata=True,
@@ -179,25 +386,30 @@ class PineconeClient:
             logger.error(f"Error querying bill: {str(e)}")
             return {"error": str(e)}
     
-    async def get_relevant_context(self, question: str) -> dict:
-        """Get relevant context from Pinecone without generating an answer"""
+    async def get_relevant_context(self, question: str, bill_id: str = None, bill_type: str = None,
+                                   congress=None, top_k: int = 25) -> dict:
+        """
+        Get relevant context from Pinecone without generating an answer.
+
+        When bill_id/bill_type/congress are given the filter is pushed down to the
+        index, so only chunks of that bill are considered.
+        """
         try:
             logger.info("Getting relevant context from Pinecone...")
-            # Create a dummy query vector (all zeros except one random position)
-            query_vector = np.zeros(3072)
-            query_vector[np.random.randint(0, 3072)] = 1
+            query_vector = await self._run_blocking(self.embedder.embed_query, question)
             
             # Use hybrid search to find relevant chunks
-            query_response = self.index.query(
+            query_response = await self._query(
                 vector=query_vector.tolist(),
-                top_k=25,
+                top_k=top_k,
                 include_metadata=True,
-                filter={}
+                filter=self._bill_filter(bill_id, bill_type, congress)
             )
             
             # Extract relevant text chunks and metadata
             context = []
             sources = []
+            chunks = []
             
             if hasattr(query_response, 'matches'):
                 for match in query_response.matches:
@@ -210,55 +422,73 @@ class PineconeClient:
                             "congress": match.metadata.get("congress"),
                             "chunk_id": match.metadata.get("chunk_id")
                         })
+                        chunks.append({
+                            "text": text,
+                            "chunk_id": match.metadata.get("chunk_id"),
+                            "score": getattr(match, "score", None)
+                        })
             
             if not context:
-                return {"context": None, "sources": []}
+                return {"context": None, "sources": [], "chunks": []}
             
             # Format context
             formatted_context = "\n\n".join(context)
             
             return {
                 "context": formatted_context,
-                "sources": sources
+                "sources": sources,
+                "chunks": chunks  # Best match first, for token-budgeted prompts
             }
         except Exception as e:
             logger.error(f"Error getting context: {str(e)}")
-            return {"context": None, "sources": []}
+            return {"context": None, "sources": [], "chunks": []}
     
-    async def search_across_bills(self, question: str) -> dict:
-        """Search for relevant context across all vectorized bills"""
+    async def search_chunks(self, question: str, congress=None, bill_type: str = None,
+                            top_k: int = 25) -> List[dict]:
+        """
+        Best matching chunks across all vectorized bills, best first.
+
+        The question is embedded once; congress/bill_type restrict the search
+        inside the index. Unlike search_across_bills, errors (e.g. the index
+        being unreachable) are raised to the caller.
+        """
+        query_vector = await self._run_blocking(self.embedder.embed_query, question)
+        query_response = await self._query(
+            vector=query_vector.tolist(),
+            top_k=top_k,
+            include_metadata=True,
+            filter=self._bill_filter(bill_type=bill_type, congress=congress)
+        )
+
+        results = []
+        for match in getattr(query_response, 'matches', None) or []:
+            if getattr(match, 'metadata', None):
+                results.append({
+                    "bill_id": match.metadata.get("bill_id"),
+                    "bill_type": match.metadata.get("bill_type"),
+                    "title": match.metadata.get("title"),
+                    "congress": match.metadata.get("congress"),
+                    "chunk_id": match.metadata.get("chunk_id"),
+                    "score": getattr(match, "score", None),
+                    "text": match.metadata.get("text", "")
+                })
+        return results
+
+    async def search_across_bills(self, question: str, congress=None, bill_type: str = None,
+                                  top_k: int = 25) -> dict:
+        """
+        Search for relevant context across all vectorized bills.
+
+        Besides the formatted context, the raw matches (best first, with
+        scores) are returned. Errors are logged and give an empty result.
+        """
         try:
             logger.info("Searching across all bills...")
-            # Create a dummy query vector (all zeros except one random position)
-            query_vector = np.zeros(3072)
-            query_vector[np.random.randint(0, 3072)] = 1
-            
-            # Use hybrid search to find relevant chunks across all bills
-            query_response = self.index.query(
-                vector=query_vector.tolist(),
-                top_k=25,  # Updated for cross-bill search
-                include_metadata=True,
-                filter={}  # No filter to search across all bills
-            )
-            
-            # Extract relevant text chunks and metadata
-            results = []
-            
-            if hasattr(query_response, 'matches'):
-                for match in query_response.matches:
-                    if hasattr(match, 'metadata'):
-                        text = match.metadata.get("text", "")
-                        bill_info = {
-                            "bill_id": match.metadata.get("bill_id"),
-                            "title": match.metadata.get("title"),
-                            "congress": match.metadata.get("congress"),
-                            "text": text
-                        }
-                        results.append(bill_info)
+            results = await self.search_chunks(question, congress=congress, bill_type=bill_type, top_k=top_k)
             
             if not results:
                 logger.info("No results found in cross-bill search")
-                return {"context": None, "bills": []}
+                return {"context": None, "bills": [], "matches": []}
             
             # Format context with bill information
             formatted_context = []
@@ -269,54 +499,85 @@ class PineconeClient:
             logger.info(f"Found {len(results)} relevant bills in cross-bill search")
             return {
                 "context": "\n\n".join(formatted_context),
-                "bills": [{"bill_id": r["bill_id"], "title": r["title"], "congress": r["congress"]} for r in results]
+                "bills": [{"bill_id": r["bill_id"], "title": r["title"], "congress": r["congress"]} for r in results],
+                "matches": results
             }
         except Exception as e:
             logger.error(f"Error searching across bills: {str(e)}")
-            return {"context": None, "bills": []}
+            return {"context": None, "bills": [], "matches": []}
     
-    async def get_full_bill_content(self, bill_id: str) -> dict:
-        """Get the entire content of a specific bill"""
+    async def iter_bill_chunks(self, bill_id: str, manifest: Dict,
+                               batch_size: int = FETCH_BATCH_SIZE) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Stream a bill's chunks in document order by fetching them by id.
+
+        Args:
+            bill_id: The bill number
+            manifest: The bill's vector manifest (the bill's `vector_manifest`).
+                Its ids are fetched in order; manifests of positional ids
+                only carry a chunk_count
+            batch_size: Ids per fetch request
+
+        Yields:
+            (position, metadata) pairs, in chunk order
+
+        Raises:
+            ValueError: If the manifest lists no chunks
+        """
+        ids = (manifest or {}).get("ids")
+        if not ids:
+            chunk_count = (manifest or {}).get("chunk_count")
+            if not chunk_count:
+                raise ValueError(f"Vector manifest of bill {bill_id} lists no chunks")
+            ids = [self.legacy_chunk_vector_id(bill_id, i) for i in range(chunk_count)]
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            response = await self._run_blocking(self.index.fetch, ids=batch)
+            vectors = response.vectors or {}
+            for i, vector_id in enumerate(batch, start):
+                vector = vectors.get(vector_id)
+                if vector is None:
+                    logger.warning(f"Chunk {vector_id} is missing from the index")
+                    continue
+                yield i, vector.metadata or {}
+
+    async def get_full_bill_content(self, bill_id: str, manifest: Dict) -> dict:
+        """
+        Get the entire content of a specific bill.
+
+        Chunks are looked up by id in batches (ids from the bill's vector
+        manifest, which callers load from the bill document; cached bills
+        do not carry it), so this costs one key read per chunk however long
+        the bill is.
+
+        Raises:
+            ValueError: If there is no manifest or it lists no chunks
+        """
+        if not manifest:
+            raise ValueError(f"Bill {bill_id} has no vector manifest; vectorize it first")
         try:
             logger.info(f"Getting full content for bill {bill_id}...")
-            # Query all chunks for this bill
-            query_response = self.index.query(
-                vector=np.zeros(3072).tolist(),  # Dummy vector
-                top_k=25,  # Updated from 1000 to be consistent
-                include_metadata=True,
-                filter={
-                    "bill_id": {"$eq": bill_id}
-                }
-            )
-            
-            if not hasattr(query_response, 'matches') or not query_response.matches:
+            texts = []
+            metadata = None
+            async for _, chunk in self.iter_bill_chunks(bill_id, manifest):
+                texts.append(chunk.get("text", ""))
+
+                # Store metadata from first chunk
+                if metadata is None:
+                    metadata = {
+                        "bill_id": chunk.get("bill_id"),
+                        "title": chunk.get("title"),
+                        "congress": chunk.get("congress")
+                    }
+
+            if not texts:
                 logger.warning(f"No content found for bill {bill_id}")
                 return {"content": None, "metadata": None}
-            
-            # Sort chunks by chunk_id to maintain order
-            chunks = []
-            metadata = None
-            for match in query_response.matches:
-                if hasattr(match, 'metadata'):
-                    chunk_id = match.metadata.get("chunk_id", 0)
-                    text = match.metadata.get("text", "")
-                    chunks.append((chunk_id, text))
-                    
-                    # Store metadata from first chunk
-                    if metadata is None:
-                        metadata = {
-                            "bill_id": match.metadata.get("bill_id"),
-                            "title": match.metadata.get("title"),
-                            "congress": match.metadata.get("congress")
-                        }
-            
-            # Sort chunks by chunk_id and join
-            chunks.sort(key=lambda x: x[0])
-            full_content = "\n\n".join(chunk[1] for chunk in chunks)
-            
-            logger.info(f"Successfully retrieved full content for bill {bill_id}")
+
+            logger.info(f"Successfully retrieved full content for bill {bill_id} ({len(texts)} chunks)")
             return {
-                "content": full_content,
+                "content": "\n\n".join(texts),
                 "metadata": metadata
             }
         except Exception as e:
@@ -0,0 +1,151 @@
+import math
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Type
+
+import numpy as np
+
+
+class BaseEmbedder:
+    """
+    Interface every embedding backend implements.
+
+    Embedders turn text into fixed-size float32 vectors so chunks and questions
+    can be compared with cosine similarity in the vector index.
+    """
+
+    dimension: int
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            np.ndarray: A (len(texts), dimension) float32 matrix of L2-normalized rows
+        """
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embed a single query string.
+
+        Args:
+            text: The query text
+
+        Returns:
+            np.ndarray: A (dimension,) float32 vector
+        """
+        return self.embed_documents([text])[0]
+
+
+# Very common words carry almost no signal for retrieval, so they get a
+# small weight instead of being dropped entirely.
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this
+to was were will with shall such any under which other than may each
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=200_000)
+def _hash_feature(feature: str, dimension: int):
+    """Map a feature string to a (bucket, sign) pair with a stable hash."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dimension, 1.0 if (h >> 31) & 1 == 0 else -1.0
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    Hashed n-gram embedder that runs on CPU with no model files and no network.
+
+    Each text is turned into word unigrams, word bigrams and character n-grams
+    of every word. Features are hashed into `dimension` buckets (with a sign bit
+    to reduce collision bias), weighted with sublinear term frequency and
+    L2-normalized. Similar wording ends up with a high cosine similarity, which
+    is what chunk retrieval for bill questions needs.
+    """
+
+    def __init__(self, dimension: int = 3072, char_ngrams: tuple = (3, 5), batch_size: int = 256):
+        self.dimension = dimension
+        self.char_ngrams = char_ngrams
+        self.batch_size = batch_size
+
+    def _features(self, text: str) -> Dict[str, float]:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        counts: Dict[str, float] = {}
+
+        for i, token in enumerate(tokens):
+            weight = 0.1 if token in STOPWORDS else 1.0
+            counts["w:" + token] = counts.get("w:" + token, 0.0) + weight
+
+            if i + 1 < len(tokens):
+                bigram = f"b:{token} {tokens[i + 1]}"
+                counts[bigram] = counts.get(bigram, 0.0) + 0.5 * weight
+
+            if weight == 1.0 and len(token) > 3:
+                padded = f"<{token}>"
+                low, high = self.char_ngrams
+                for n in range(low, high + 1):
+                    for j in range(len(padded) - n + 1):
+                        gram = "c:" + padded[j:j + n]
+                        counts[gram] = counts.get(gram, 0.0) + 0.25
+
+        return counts
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            rows, cols, values = [], [], []
+
+            for row, text in enumerate(batch):
+                for feature, count in self._features(text).items():
+                    bucket, sign = _hash_feature(feature, self.dimension)
+                    rows.append(row)
+                    cols.append(bucket)
+                    values.append(sign * math.log1p(count))
+
+            block = np.zeros((len(batch), self.dimension), dtype=np.float32)
+            if rows:
+                np.add.at(block, (np.asarray(rows), np.asarray(cols)), np.asarray(values, dtype=np.float32))
+
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            result[start:start + len(batch)] = block / norms
+
+        return result
+
+
+EMBEDDERS: Dict[str, Type[BaseEmbedder]] = {
+    "hashing": HashingEmbedder,
+}
+
+
+def get_embedder(backend: str = None, dimension: int = None) -> BaseEmbedder:
+    """
+    Build the embedding backend configured for this deployment.
+
+    Args:
+        backend: Name of the backend in EMBEDDERS (defaults to EMBEDDING_BACKEND or "hashing")
+        dimension: Vector size (defaults to EMBEDDING_DIMENSION or 3072)
+
+    Returns:
+        BaseEmbedder: The configured embedder
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "hashing")
+    dimension = dimension or int(os.getenv("EMBEDDING_DIMENSION", "3072"))
+
+    if backend not in EMBEDDERS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    return EMBEDDERS[backend](dimension=dimension)
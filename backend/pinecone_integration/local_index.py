@@ -0,0 +1,409 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Metadata fields with an inverted index so bill-scoped filters only touch
+# the rows of that bill instead of the whole matrix.
+INDEXED_FIELDS = ("bill_id", "bill_type", "congress")
+
+# The metadata log is rewritten once it has this many more entries than live
+# vectors (superseded upserts, updates and deletes)
+COMPACT_MIN_GARBAGE = 10_000
+
+
+class Match:
+    """A single query result, shaped like a Pinecone ScoredVector."""
+
+    def __init__(self, id: str, score: float, metadata: Optional[dict] = None, values: Optional[list] = None):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+        self.values = values
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+class QueryResponse:
+    """Query results, shaped like a Pinecone QueryResponse."""
+
+    def __init__(self, matches: List[Match]):
+        self.matches = matches
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+class FetchResponse:
+    """Fetch results, shaped like a Pinecone FetchResponse."""
+
+    def __init__(self, vectors: Dict[str, Match]):
+        self.vectors = vectors
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+class LocalIndex:
+    """
+    In-process vector index with the subset of the Pinecone Index API the app uses.
+
+    Vectors live in a memory-mapped float32 matrix on disk, so they are paged
+    in on demand rather than loaded into RAM. Metadata (including each chunk's
+    text) is kept in memory and persisted in an append-only JSON lines log
+    that is replayed on open; the log is compacted to one entry per live
+    vector once superseded entries pile up. Queries support Pinecone-style
+    metadata filters and either exact (brute force) or approximate (IVF)
+    cosine search.
+    """
+
+    def __init__(self, path: str, dimension: int, mode: str = "auto", exact_threshold: int = 50_000, nprobe: int = 8):
+        """
+        Open (or create) a local index.
+
+        Args:
+            path: Directory holding the vector matrix and metadata log
+            dimension: Vector dimension
+            mode: "exact", "ivf" or "auto" (IVF once the index outgrows exact_threshold)
+            exact_threshold: Number of candidate rows above which "auto" uses IVF
+            nprobe: Number of IVF lists scanned per query
+        """
+        self.path = path
+        self.dimension = dimension
+        self.mode = mode
+        self.exact_threshold = exact_threshold
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[dict]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._postings: Dict[str, Dict[object, set]] = {field: {} for field in INDEXED_FIELDS}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._assignments: Dict[int, int] = {}
+        self._live: Optional[np.ndarray] = None
+
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._log_path = os.path.join(path, "metadata.jsonl")
+        self._capacity = 0
+        self._matrix = None
+        self._log_entries = 0
+        self._load()
+
+    # Storage
+
+    def _open_matrix(self, capacity: int):
+        size = capacity * self.dimension * 4
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        self._capacity = capacity
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+    def _ensure_capacity(self, rows: int):
+        if rows > self._capacity:
+            self._open_matrix(max(rows, self._capacity * 2, 1024))
+
+    def _load(self):
+        existing = os.path.getsize(self._vectors_path) // (self.dimension * 4) if os.path.exists(self._vectors_path) else 0
+        self._open_matrix(max(existing, 1024))
+
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path) as f:
+            for line in f:
+                self._log_entries += 1
+                entry = json.loads(line)
+                if entry["op"] == "upsert":
+                    self._set_row(entry["row"], entry["id"], entry["metadata"])
+                elif entry["op"] == "update":
+                    row = self._rows.get(entry["id"])
+                    if row is not None:
+                        self._set_row(row, entry["id"], {**self._metadata[row], **entry["metadata"]})
+                elif entry["op"] == "delete":
+                    self._clear_row(entry["id"])
+
+        self._free = [row for row, id_ in enumerate(self._ids) if id_ is None]
+        self._compact_if_needed()
+
+    def _append_log(self, entries: Iterable[dict]):
+        with open(self._log_path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+                self._log_entries += 1
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self._log_entries - len(self._rows) > max(COMPACT_MIN_GARBAGE, len(self._rows)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the metadata log as one upsert entry per live vector."""
+        with self._lock:
+            tmp_path = self._log_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                for id_, row in self._rows.items():
+                    f.write(json.dumps({"op": "upsert", "id": id_, "row": row, "metadata": self._metadata[row]}) + "\n")
+            os.replace(tmp_path, self._log_path)
+            self._log_entries = len(self._rows)
+
+    def _live_rows(self) -> np.ndarray:
+        if self._live is None:
+            self._live = np.array([row for row, id_ in enumerate(self._ids) if id_ is not None], dtype=np.int64)
+        return self._live
+
+    def _set_row(self, row: int, id_: str, metadata: dict):
+        self._live = None
+        while len(self._ids) <= row:
+            self._ids.append(None)
+            self._metadata.append(None)
+        if self._ids[row] is not None:
+            self._unindex(row)
+        self._ids[row] = id_
+        self._metadata[row] = metadata
+        self._rows[id_] = row
+        for field in INDEXED_FIELDS:
+            if field in metadata:
+                self._postings[field].setdefault(metadata[field], set()).add(row)
+
+    def _unindex(self, row: int):
+        for field in INDEXED_FIELDS:
+            value = (self._metadata[row] or {}).get(field)
+            if value in self._postings[field]:
+                self._postings[field][value].discard(row)
+
+    def _clear_row(self, id_: str) -> Optional[int]:
+        row = self._rows.pop(id_, None)
+        if row is None:
+            return None
+        self._unindex(row)
+        self._live = None
+        self._ids[row] = None
+        self._metadata[row] = None
+        cluster = self._assignments.pop(row, None)
+        if cluster is not None:
+            self._lists[cluster].remove(row)
+        return row
+
+    # Pinecone Index API
+
+    def upsert(self, vectors: List[dict], **kwargs) -> dict:
+        """Insert or overwrite vectors given as {"id", "values", "metadata"} dicts."""
+        with self._lock:
+            log = []
+            for vector in vectors:
+                id_ = vector["id"]
+                metadata = vector.get("metadata") or {}
+                row = self._rows.get(id_)
+                if row is None:
+                    row = self._free.pop() if self._free else len(self._ids)
+                self._ensure_capacity(row + 1)
+
+                values = np.asarray(vector["values"], dtype=np.float32)
+                norm = np.linalg.norm(values)
+                self._matrix[row] = values / norm if norm else values
+                self._set_row(row, id_, metadata)
+                self._assign(row)
+                log.append({"op": "upsert", "id": id_, "row": row, "metadata": metadata})
+
+            self._matrix.flush()
+            self._append_log(log)
+            return {"upserted_count": len(vectors)}
+
+    def update(self, id: str, set_metadata: Optional[dict] = None, **kwargs):
+        """Merge `set_metadata` into the metadata of an existing vector."""
+        with self._lock:
+            row = self._rows.get(id)
+            if row is None or not set_metadata:
+                return {}
+            self._set_row(row, id, {**self._metadata[row], **set_metadata})
+            self._append_log([{"op": "update", "id": id, "metadata": set_metadata}])
+            return {}
+
+    def delete(self, ids: Optional[List[str]] = None, filter: Optional[dict] = None, **kwargs):
+        """Delete vectors by id or by metadata filter."""
+        with self._lock:
+            if filter:
+                rows = self._candidate_rows(filter)
+                ids = [self._ids[row] for row in (rows if rows is not None else range(len(self._ids))) if self._ids[row]]
+            log = []
+            for id_ in ids or []:
+                row = self._clear_row(id_)
+                if row is not None:
+                    self._free.append(row)
+                    log.append({"op": "delete", "id": id_})
+            self._append_log(log)
+            return {}
+
+    def fetch(self, ids: List[str], **kwargs) -> FetchResponse:
+        """Look up vectors by id."""
+        with self._lock:
+            vectors = {}
+            for id_ in ids:
+                row = self._rows.get(id_)
+                if row is not None:
+                    vectors[id_] = Match(id_, 1.0, self._metadata[row], self._matrix[row].tolist())
+            return FetchResponse(vectors)
+
+    def query(self, vector: List[float], top_k: int = 10, include_metadata: bool = False,
+              filter: Optional[dict] = None, include_values: bool = False, **kwargs) -> QueryResponse:
+        """Return the top_k vectors by cosine similarity that match `filter`."""
+        with self._lock:
+            query = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm:
+                query = query / norm
+
+            candidates = self._candidate_rows(filter)
+            if candidates is None:
+                use_ivf = self.mode == "ivf" or (self.mode == "auto" and len(self._rows) > self.exact_threshold)
+                if use_ivf:
+                    if self._centroids is None:
+                        self.build_ivf()
+                    candidates = self._probe(query)
+                else:
+                    candidates = self._live_rows()
+            if len(candidates) == 0:
+                return QueryResponse([])
+
+            rows = np.asarray(candidates, dtype=np.int64)
+            scores = self._matrix[rows] @ query
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return QueryResponse([
+                Match(
+                    self._ids[rows[i]],
+                    float(scores[i]),
+                    self._metadata[rows[i]] if include_metadata else None,
+                    self._matrix[rows[i]].tolist() if include_values else None,
+                )
+                for i in top
+            ])
+
+    def describe_index_stats(self, **kwargs) -> dict:
+        return {"dimension": self.dimension, "total_vector_count": len(self._rows)}
+
+    # Filtering
+
+    def _candidate_rows(self, filter: Optional[dict]) -> Optional[list]:
+        """Rows matching `filter`, or None when the filter does not restrict anything."""
+        if not filter:
+            return None
+
+        clauses = filter["$and"] if "$and" in filter else [{k: v} for k, v in filter.items()]
+        postings = []
+        residual = []
+
+        for clause in clauses:
+            (field, condition), = clause.items()
+            if isinstance(condition, dict):
+                if "$eq" in condition:
+                    values = [condition["$eq"]]
+                elif "$in" in condition:
+                    values = condition["$in"]
+                else:
+                    residual.append((field, condition))
+                    continue
+            else:
+                values = [condition]
+
+            if field in INDEXED_FIELDS:
+                if len(values) == 1:
+                    postings.append(self._postings[field].get(values[0], set()))
+                else:
+                    postings.append(set().union(*(self._postings[field].get(value, set()) for value in values)))
+            else:
+                residual.append((field, {"$in": values}))
+
+        # Intersect starting from the most selective posting list
+        rows: Optional[set] = None
+        for matched in sorted(postings, key=len):
+            rows = set(matched) if rows is None else rows & matched
+            if not rows:
+                break
+
+        if rows is None:
+            rows = set(self._live_rows().tolist())
+        if residual:
+            rows = {row for row in rows if all(self._matches(self._metadata[row], f, c) for f, c in residual)}
+        return sorted(rows)
+
+    @staticmethod
+    def _matches(metadata: dict, field: str, condition: dict) -> bool:
+        value = metadata.get(field)
+        if "$in" in condition:
+            return value in condition["$in"]
+        if "$ne" in condition:
+            return value != condition["$ne"]
+        if "$nin" in condition:
+            return value not in condition["$nin"]
+        if "$gte" in condition and not (value is not None and value >= condition["$gte"]):
+            return False
+        if "$lte" in condition and not (value is not None and value <= condition["$lte"]):
+            return False
+        return True
+
+    # Approximate search (inverted file)
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, sample_size: int = 50_000):
+        """
+        Cluster the vectors with k-means so queries only scan the nearest lists.
+
+        Args:
+            nlist: Number of clusters (defaults to sqrt of the number of vectors)
+            iterations: k-means iterations
+            sample_size: Number of vectors used to train the centroids
+        """
+        with self._lock:
+            rows = self._live_rows()
+            if len(rows) == 0:
+                return
+            nlist = nlist or max(1, int(np.sqrt(len(rows))))
+            rng = np.random.default_rng(0)
+
+            sample = self._matrix[rng.choice(rows, size=min(sample_size, len(rows)), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=min(nlist, len(sample)), replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(len(centroids)):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroid = members.mean(axis=0)
+                        centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+            self._centroids = centroids
+            self._lists = [[] for _ in range(len(centroids))]
+            self._assignments = {}
+            for start in range(0, len(rows), 65_536):
+                block = rows[start:start + 65_536]
+                for row, label in zip(block, np.argmax(self._matrix[block] @ centroids.T, axis=1)):
+                    self._lists[label].append(int(row))
+                    self._assignments[int(row)] = int(label)
+
+    def _assign(self, row: int):
+        if self._centroids is None:
+            return
+        previous = self._assignments.pop(row, None)
+        if previous is not None:
+            self._lists[previous].remove(row)
+        label = int(np.argmax(self._centroids @ self._matrix[row]))
+        self._lists[label].append(row)
+        self._assignments[row] = label
+
+    def _probe(self, query: np.ndarray) -> list:
+        nearest = np.argsort(-(self._centroids @ query))[:self.nprobe]
+        return [row for cluster in nearest for row in self._lists[cluster]]
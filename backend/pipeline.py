@@ -0,0 +1,203 @@
+import asyncio
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# Fields the workers need from a bill document
+BILL_PROJECTION = {
+    "number": 1, "type": 1, "congress": 1, "title": 1,
+    "text_link": 1, "summary": 1, "vectorized": 1, "pipeline": 1
+}
+
+
+class RateLimiter:
+    """Spaces out calls so at most `rate_per_minute` start in any minute"""
+
+    def __init__(self, rate_per_minute: float):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+class BillPipeline:
+    """
+    Background worker that precomputes summaries and vectors for bills.
+
+    Picks up bills the scraper has stored with a text link but no summary
+    and/or no vectors, and runs the same summarize/vectorize functions the
+    API uses (so they are single-flighted with user requests). Each worker
+    claims one bill at a time with an expiring claim, so several API
+    processes can run the pipeline without doing the same work twice.
+
+    Progress is recorded on the bill in a `pipeline` sub-document:
+    status ("running", "retry", "done" or "failed"), attempts, last_error,
+    next_attempt_at, and summarized_at/vectorized_at timestamps.
+
+    Only bills flagged `pipeline.pending` are considered. The scraper sets
+    the flag when it stores a bill that needs work and the pipeline clears
+    it when the bill is done or has failed for good, so the claim query
+    walks a partial index of pending bills instead of the whole collection.
+    """
+
+    def __init__(self, collection,
+                 summarize: Callable[[dict], Awaitable],
+                 vectorize: Callable[[dict], Awaitable],
+                 concurrency: int = 2, rate_per_minute: float = 30,
+                 max_attempts: int = 5, retry_base_seconds: float = 60,
+                 claim_seconds: float = 600, idle_seconds: float = 30):
+        """
+        Args:
+            collection: Motor collection of bills
+            summarize: Coroutine function generating and storing a bill's summary
+            vectorize: Coroutine function vectorizing a bill and setting its flag
+            concurrency: Number of bills processed at the same time
+            rate_per_minute: Maximum number of bills started per minute (LLM/API quota)
+            max_attempts: Attempts before a bill is marked as failed
+            retry_base_seconds: First retry delay, doubled after every failure
+            claim_seconds: How long a claimed bill is reserved for a worker
+            idle_seconds: Sleep when there is no work
+        """
+        self.collection = collection
+        self.summarize = summarize
+        self.vectorize = vectorize
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate_per_minute)
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.claim_seconds = claim_seconds
+        self.idle_seconds = idle_seconds
+        self._tasks = []
+
+    async def setup(self):
+        await self.collection.create_index("pipeline.status")
+        await self.collection.create_index(
+            [("pipeline.pending", 1), ("_id", -1)],
+            name="pipeline_pending",
+            partialFilterExpression={"pipeline.pending": True}
+        )
+        # Flag bills stored before the scraper set pipeline.pending
+        result = await self.collection.update_many(
+            {
+                "pipeline.pending": {"$exists": False},
+                "text_link": {"$nin": [None, "", []]},
+                "pipeline.status": {"$ne": "failed"},
+                "$or": [{"summary": {"$in": [None, ""]}}, {"vectorized": {"$ne": True}}]
+            },
+            {"$set": {"pipeline.pending": True}}
+        )
+        if result.modified_count:
+            logger.info(f"Flagged {result.modified_count} bills for the pipeline")
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        logger.info(f"Bill pipeline started with {self.concurrency} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, number: int):
+        while True:
+            try:
+                bill = await self._claim()
+                if bill is None:
+                    await asyncio.sleep(self.idle_seconds)
+                    continue
+                await self.rate_limiter.wait()
+                await self.process(bill)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pipeline worker {number} error: {str(e)}")
+                await asyncio.sleep(self.idle_seconds)
+
+    async def _claim(self) -> Optional[dict]:
+        """Atomically reserve the next bill that needs work"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "pipeline.pending": True,
+                "pipeline.status": {"$in": [None, "retry", "running"]},
+                "text_link": {"$nin": [None, "", []]},
+                "$and": [
+                    {"$or": [{"summary": {"$in": [None, ""]}}, {"vectorized": {"$ne": True}}]},
+                    {"$or": [{"pipeline.next_attempt_at": None}, {"pipeline.next_attempt_at": {"$lte": now}}]},
+                    {"$or": [{"pipeline.claimed_until": None}, {"pipeline.claimed_until": {"$lt": now}}]}
+                ]
+            },
+            {"$set": {
+                "pipeline.status": "running",
+                "pipeline.claimed_until": now + timedelta(seconds=self.claim_seconds),
+                "pipeline.updated_at": now
+            }},
+            projection=BILL_PROJECTION,
+            sort=[("_id", -1)],  # Newest bills first
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def process(self, bill: dict):
+        """Summarize and vectorize one claimed bill, recording the outcome"""
+        progress = {}
+        try:
+            if not bill.get("summary"):
+                await self.summarize(bill)
+                progress["pipeline.summarized_at"] = datetime.utcnow()
+            if not bill.get("vectorized"):
+                await self.vectorize(bill)
+                progress["pipeline.vectorized_at"] = datetime.utcnow()
+        except Exception as e:
+            await self._record_failure(bill, progress, getattr(e, "detail", None) or str(e))
+            return
+
+        await self.collection.update_one(
+            {"_id": bill["_id"]},
+            {
+                "$set": {
+                    **progress,
+                    "pipeline.status": "done",
+                    "pipeline.pending": False,
+                    "pipeline.updated_at": datetime.utcnow()
+                },
+                "$unset": {"pipeline.claimed_until": "", "pipeline.next_attempt_at": "", "pipeline.last_error": ""}
+            }
+        )
+        logger.info(f"Pipeline processed bill {bill['congress']}/{bill['type']}/{bill['number']}")
+
+    async def _record_failure(self, bill: dict, progress: dict, error: str):
+        attempts = (bill.get("pipeline") or {}).get("attempts", 0) + 1
+        failed = attempts >= self.max_attempts
+        delay = self.retry_base_seconds * (2 ** (attempts - 1))
+        logger.warning(
+            f"Pipeline failed for bill {bill['congress']}/{bill['type']}/{bill['number']} "
+            f"(attempt {attempts}): {error}"
+        )
+        await self.collection.update_one(
+            {"_id": bill["_id"]},
+            {
+                "$set": {
+                    **progress,
+                    "pipeline.status": "failed" if failed else "retry",
+                    "pipeline.pending": not failed,
+                    "pipeline.attempts": attempts,
+                    "pipeline.last_error": error,
+                    "pipeline.next_attempt_at": datetime.utcnow() + timedelta(seconds=delay),
+                    "pipeline.updated_at": datetime.utcnow()
+                },
+                "$unset": {"pipeline.claimed_until": ""}
+            }
+        )
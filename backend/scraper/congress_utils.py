@@ -1,5 +1,4 @@
-import requests
-import time
+import asyncio
 import os
 
 from dotenv import load_dotenv
@@ -7,17 +6,30 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+from fetch_engine import BASE_URL, CongressFetcher
+
 API_KEY = os.getenv("CONGRESS_API_KEY")
 if not API_KEY:
     raise ValueError("Please set CONGRESS_API_KEY environment variable")
-    
-def fetch_recent_bills():
-    """Fetch recent bills from the Congress.gov API"""
-    url = f"https://api.congress.gov/v3/bill?format=json&api_key={API_KEY}&fromDateTime=2024-01-01T00:00:00Z&sort=updateDate+asc&limit=250"
-    response = requests.get(url)
-    return response.json()
-
-def enrich_bill(bill):
+
+async def fetch_updated_bills(fetcher: CongressFetcher, congress, since):
+    """
+    Page through the bills of a congress updated at or after `since`
+    (an ISO timestamp), oldest update first.
+    """
+    url = f"{BASE_URL}/bill/{congress}"
+    params = dict(fromDateTime=since, sort="updateDate asc", limit=250)
+    while url:
+        j = await fetcher.get_json(url, **params)
+        yield j.get('bills', [])
+        pagination = j.get('pagination')
+        if not pagination or 'next' not in pagination:
+            break
+        # the next url already carries the paging parameters
+        url = pagination['next']
+        params = {}
+
+async def enrich_bill(fetcher: CongressFetcher, bill):
     """
     Enrich a bill with additional information and download bill text/PDF.
     Returns True if text was found, None if not (for backwards compatibility)
@@ -35,20 +47,23 @@ def enrich_bill(bill):
     })
 
     # get the bill text
-    url = f"https://api.congress.gov/v3/bill/{congress}/{bill_type}/{bill_number}/text?format=json&api_key={API_KEY}"
-    response = requests.get(url)
-    j = response.json()
+    try:
+        j = await fetcher.get_json(f"{BASE_URL}/bill/{congress}/{bill_type}/{bill_number}/text")
+    except Exception as e:
+        bill['enrichment_error'] = f'Failed to fetch text versions for bill {congress}/{bill_type}/{bill_number}: {e}'
+        print(f'[!] Warning: {bill["enrichment_error"]}')
+        return None
     text_versions = j.get('textVersions', [])
-    
+
     if not text_versions:
         bill['enrichment_error'] = f'No text versions found for bill {congress}/{bill_type}/{bill_number}'
         print(f'[!] Warning: {bill["enrichment_error"]}')
         return None
-    
+
     texts = text_versions[0]
     pdf_link = [f['url'] for f in texts['formats'] if f['type'] == 'PDF']
     text_link = [f['url'] for f in texts['formats'] if f['type'] == 'Formatted Text']
-    
+
     if not pdf_link or not text_link:
         bill['enrichment_error'] = f'Missing links for bill {congress}/{bill_type}/{bill_number}'
         print(f'[!] Warning: {bill["enrichment_error"]}')
@@ -57,25 +72,21 @@ def enrich_bill(bill):
     # Update bill with links
     bill['pdf_link'] = pdf_link[0]
     bill['text_link'] = text_link[0]
-    
+
     # Create directory structure
     bill_dir = os.path.join('bin', str(congress), bill_type, str(bill_number))
     os.makedirs(bill_dir, exist_ok=True)
 
-    time.sleep(1)
     return True
 
-def get_bills_historical(congress):
-    """Get all bills for a given congress"""
-    url = f"https://api.congress.gov/v3/bill/{congress}?format=json&api_key={API_KEY}&fromDateTime=2024-01-01T00:00:00Z&sort=updateDate+asc&limit=250"
-    while url:
-        response = requests.get(url)
-        j = response.json()
-        yield j['bills']
-        pagination = j.get('pagination')
-        if not pagination or 'next' not in pagination:
-            break
-        url = pagination['next']
-        # add api_key to url
-        url = f"{url}&api_key={API_KEY}"
-        time.sleep(1)
+async def enrich_bills(fetcher: CongressFetcher, bills):
+    """Enrich bills concurrently (bounded by the fetcher), setting has_text on each"""
+    results = await asyncio.gather(*(enrich_bill(fetcher, bill) for bill in bills))
+    for bill, enriched in zip(bills, results):
+        bill['has_text'] = enriched  # Track whether bill has text
+    return bills
+
+async def get_bills_historical(fetcher: CongressFetcher, congress, since="2024-01-01T00:00:00Z"):
+    """Get all bills for a given congress, one page at a time"""
+    async for bills in fetch_updated_bills(fetcher, congress, since):
+        yield bills
@@ -1,6 +1,9 @@
-from pymongo import errors, InsertOne, MongoClient
+from pymongo import errors, UpdateOne, MongoClient
 import os
-import random
+import time
+from datetime import datetime, timedelta
+
+from sync_utils import bill_key, search_terms
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 
@@ -8,31 +11,160 @@ MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 client = MongoClient(MONGO_URI)
 db = client.congress_bills
 bills_collection = db.bills
+sync_state = db.sync_state
 # create unique index on number+congress+type
 try:
     bills_collection.create_index([("number", 1), ("congress", 1), ("type", 1)], unique=True)
 except: pass
-try:
-    # create search index on title
-    bills_collection.create_index([("title", "text")])
-except: pass
+# Search indexes (weighted text index, search_terms) are created by the API
+
+# Days of latestAction dates kept in action_dates (the API's trending
+# velocity counts the last 14)
+ACTION_HISTORY_DAYS = 30
+
+
+def load_bills_by_keys(bills):
+    """Load the stored versions of `bills` (one page from the API), keyed by congress-type-number"""
+    if not bills:
+        return {}
+    query = {"$or": [
+        {"congress": bill["congress"], "type": bill["type"], "number": bill["number"]}
+        for bill in bills
+    ]}
+    projection = {'congress': 1, 'type': 1, 'number': 1, 'text_link': 1, 'pdf_link': 1,
+                  'updateDate': 1, 'updateDateIncludingText': 1, 'latestAction': 1, 'title': 1}
+    return {
+        f"{bill['congress']}-{bill['type']}-{bill['number']}": bill
+        for bill in bills_collection.find(query, projection)
+    }
+
+def get_checkpoint(name):
+    """Return the stored sync checkpoint called `name`, or None"""
+    state = sync_state.find_one({"_id": name})
+    return state["value"] if state else None
+
+def save_checkpoint(name, value):
+    sync_state.update_one({"_id": name}, {"$set": {"value": value}}, upsert=True)
+
+# Whether the API's background pipeline still has to summarize or vectorize a
+# bill: it has text, lacks a summary or vectors and has not failed for good.
+# The pipeline only scans bills flagged pipeline.pending (a partial index).
+PENDING_EXPRESSION = {"$and": [
+    {"$not": [{"$in": [{"$ifNull": ["$text_link", None]}, [None, "", []]]}]},
+    {"$or": [
+        {"$in": [{"$ifNull": ["$summary", None]}, [None, ""]]},
+        {"$ne": ["$vectorized", True]}
+    ]},
+    {"$ne": ["$pipeline.status", "failed"]}
+]}
+
+class BulkUpsertWriter:
+    """
+    Buffers bill upserts and writes them as unordered bulk writes.
+
+    Each bill becomes an UpdateOne with upsert=True keyed on the unique
+    number+congress+type index, so re-scraped bills update their stored copy
+    (e.g. with newly available text links) instead of being dropped as
+    duplicates. The buffer is flushed when it reaches `batch_size` bills or
+    when `flush_interval` seconds have passed since the last flush. One
+    writer is kept open for a whole sync or backfill run, so small pages are
+    batched together; checkpoints must only move once flush_if_due() (or
+    add_page()) reports that everything queued has been written.
+
+    Usage:
+        with BulkUpsertWriter() as writer:
+            for page in pages:
+                if writer.add_page(page):
+                    save_checkpoint(...)
+        print(writer.stats)
+    """
+
+    def __init__(self, collection=None, batch_size=500, flush_interval=5.0):
+        self.collection = collection if collection is not None else bills_collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.operations = []
+        self.last_flush = time.monotonic()
+        self.stats = {"inserted": 0, "modified": 0, "unchanged": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def add(self, bill, stale=False):
+        """
+        Queue an upsert of `bill`. With stale=True the bill got a new text
+        version, so its summary, vectors and pipeline state are cleared to
+        have them regenerated.
+        """
+        # An update pipeline, so action_dates can be added to and pruned in
+        # one write; $literal keeps bill values from being read as expressions
+        fields = {**bill, "search_terms": search_terms(bill)}
+        update = [{"$set": {field: {"$literal": value} for field, value in fields.items()}}]
+        action_date = (bill.get("latestAction") or {}).get("actionDate")
+        if action_date:
+            # Distinct recent action dates for the API's trending velocity
+            cutoff = (datetime.utcnow() - timedelta(days=ACTION_HISTORY_DAYS)).date().isoformat()
+            update.append({"$set": {"action_dates": {"$filter": {
+                "input": {"$setUnion": [{"$ifNull": ["$action_dates", []]}, [action_date]]},
+                "cond": {"$gte": ["$$this", cutoff]}
+            }}}})
+        if stale:
+            update.append({"$unset": ["summary", "vectorized", "pipeline"]})
+        update.append({"$set": {"pipeline.pending": PENDING_EXPRESSION}})
+        self.operations.append(UpdateOne(
+            {"number": bill["number"], "congress": bill["congress"], "type": bill["type"]},
+            update,
+            upsert=True
+        ))
+        if len(self.operations) >= self.batch_size or self.due():
+            self.flush()
+
+    def add_page(self, bills, stale_keys=()):
+        """
+        Queue a page of bills (see add) and flush if the buffer is due.
+        Returns True if everything queued so far is written.
+        """
+        for bill in bills:
+            self.add(bill, stale=bill_key(bill) in stale_keys)
+        return self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush if the buffer is overdue; returns True if nothing is left buffered"""
+        if self.due():
+            self.flush()
+        return not self.operations
+
+    def due(self):
+        """Whether buffered operations have waited longer than flush_interval"""
+        return bool(self.operations) and time.monotonic() - self.last_flush >= self.flush_interval
+
+    def flush(self):
+        operations, self.operations = self.operations, []
+        self.last_flush = time.monotonic()
+        if not operations:
+            return
+
+        try:
+            self._count(result_counts(self.collection.bulk_write(operations, ordered=False)))
+        except errors.BulkWriteError as e:
+            self._count(e.details)
+            # Two concurrent upserts of a new bill can race on the unique
+            # index; the retry finds the inserted document and updates it
+            retry = [operations[err['index']] for err in e.details['writeErrors'] if err['code'] == 11000]
+            other = [err for err in e.details['writeErrors'] if err['code'] != 11000]
+            if other:
+                raise
+            if retry:
+                self._count(result_counts(self.collection.bulk_write(retry, ordered=False)))
 
+    def _count(self, result):
+        self.stats["inserted"] += result["nUpserted"]
+        self.stats["modified"] += result["nModified"]
+        self.stats["unchanged"] += result["nMatched"] - result["nModified"]
 
-def load_existing_bills():
-    """Load existing bills from the database, returning relevant fields"""
-    return db.bills.find({}, {'congress': 1, 'type': 1, 'number': 1, 'text_link': 1})
-
-def add_to_db(new_bills):
-    """Save new bills to MongoDB"""
-    if not new_bills:
-        return
-    
-    requests = [InsertOne(bill) for bill in new_bills]
-    try:
-        bills_collection.bulk_write(requests, ordered=False)
-    except errors.BulkWriteError as e:
-        dups = [op for op in e.details['writeErrors'] if op['code'] == 11000]
-        if not dups:
-            raise
-        else:
-            print(f"Duplicate bill number found, skipping: {dups}")
+def result_counts(result):
+    """Normalize a BulkWriteResult to the counters reported in BulkWriteError.details"""
+    return {"nUpserted": result.upserted_count, "nModified": result.modified_count, "nMatched": result.matched_count}
@@ -0,0 +1,106 @@
+"""
+Asyncio fetch engine for the Congress.gov API: one pooled session, a token
+bucket matched to the API quota, bounded concurrency and retry with backoff.
+"""
+
+import asyncio
+import os
+import random
+import time
+
+import aiohttp
+from yarl import URL
+
+API_KEY = os.getenv("CONGRESS_API_KEY")
+BASE_URL = os.getenv("CONGRESS_API_URL", "https://api.congress.gov/v3")
+
+# Congress.gov allows 5,000 requests per hour per key
+RATE_PER_HOUR = float(os.getenv("CONGRESS_API_RATE_PER_HOUR", 5000))
+BURST = int(os.getenv("CONGRESS_API_BURST", 20))
+CONCURRENCY = int(os.getenv("CONGRESS_API_CONCURRENCY", 8))
+MAX_RETRIES = int(os.getenv("CONGRESS_API_MAX_RETRIES", 5))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CongressFetcher:
+    """
+    Shared client for all Congress.gov API calls made by the scrapers.
+
+    Usage:
+        async with CongressFetcher() as fetcher:
+            data = await fetcher.get_json(f"{BASE_URL}/bill")
+    """
+
+    def __init__(self, api_key=API_KEY, rate_per_hour=RATE_PER_HOUR, burst=BURST,
+                 concurrency=CONCURRENCY, max_retries=MAX_RETRIES):
+        self.api_key = api_key
+        self.bucket = TokenBucket(rate_per_hour / 3600, burst)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.session = None
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get_json(self, url, **params):
+        """
+        GET a Congress.gov API URL and return the decoded JSON.
+        The API key and format are added to the query string.
+        Retries 429/5xx responses and connection errors with exponential backoff.
+        """
+        url = URL(url).update_query(format="json", api_key=self.api_key, **params)
+
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            async with self.semaphore:
+                self.requests += 1
+                try:
+                    async with self.session.get(url) as response:
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            return await response.json()
+                        retry_after = response.headers.get("Retry-After")
+                        error = f"HTTP {response.status}"
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    retry_after = None
+                    error = repr(e)
+
+            if attempt == self.max_retries:
+                raise RuntimeError(f"Giving up on {url.with_query(None)} after {attempt + 1} attempts: {error}")
+
+            self.retries += 1
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else min(60, 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, 0.5))
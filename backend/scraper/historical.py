@@ -1,54 +1,122 @@
 """
-This is a simple script that periodically downloads bills from cpo.congress.gov, and saves them to a local DB
+This is a simple script that downloads all bills of a congress from cpo.congress.gov, and saves them to a local DB
+
+Pages stream through three stages connected by small bounded queues:
+fetch pages -> enrich the bills that need it -> write them in bulk. A slow
+stage makes the others wait instead of piling pages up in memory, so memory
+stays flat for any congress and the first bills are written within seconds.
+After each page is written its last update time is saved as a checkpoint,
+and a restarted backfill resumes from there.
 """
 
 import argparse
+import asyncio
 from datetime import datetime
-from pymongo import MongoClient, errors
 
 from env_utils import IS_PROD
-from congress_utils import enrich_bill, get_bills_historical
-from db_utils import load_existing_bills, add_to_db
+from congress_utils import enrich_bills, get_bills_historical
+from db_utils import BulkUpsertWriter, load_bills_by_keys, get_checkpoint, save_checkpoint
+from fetch_engine import CongressFetcher
+from sync_utils import bill_key, sort_timestamp
 
 # Constants
 POLLING_INTERVAL = 1800 if IS_PROD else 5  # Check every half an hour
+QUEUE_SIZE = 2  # Pages buffered between stages
+DONE = None  # Sentinel closing a queue
 
-def main(congress):
+async def main(congress, since=None, restart=False):
     print("Starting historical bill downloader...")
-    
-    # Get existing bill numbers from MongoDB
-    existing_bills = load_existing_bills()
-    existing_bills_map = {
-        f"{bill['congress']}-{bill['type']}-{bill['number']}": bill.get('text_link')
-        for bill in existing_bills
-    }
-
-    # Fetch new bills
-    bills = get_bills_historical(congress)
-    bills = list(bills)
-    
-    for bill_batch in bills:
-        # filter out bills that are already in the db AND have text
-        new_bills = [
-            bill for bill in bill_batch 
-            if (f"{bill['congress']}-{bill['type']}-{bill['number']}" not in existing_bills_map or
-                not existing_bills_map[f"{bill['congress']}-{bill['type']}-{bill['number']}"])  # Check text_link in existing bill
-        ]
-
-        if new_bills:
-            print(f"Found {len(new_bills)} bills to process")
-            processed_bills = []
-            for bill in new_bills:
-                enriched = enrich_bill(bill)
-                bill['has_text'] = enriched  # Track whether bill has text
-                processed_bills.append(bill)  # Add all bills, even those without text
-            add_to_db(processed_bills)
-        else:
-            print("No new or text-less bills found")
+    checkpoint_name = f"historical:{congress}"
+    # An explicit --since takes precedence over the saved checkpoint
+    if not since and not restart:
+        since = get_checkpoint(checkpoint_name)
+    if since:
+        print(f"Resuming congress {congress} from {since}")
+
+    async with CongressFetcher() as fetcher:
+        await download(fetcher, congress, since, checkpoint_name)
+
+async def download(fetcher, congress, since, checkpoint_name):
+    pages = asyncio.Queue(maxsize=QUEUE_SIZE)
+    enriched = asyncio.Queue(maxsize=QUEUE_SIZE)
+    writer = BulkUpsertWriter()
+    totals = writer.stats
+    pages_done = 0
+    started = datetime.now()
+
+    async def fetch_pages():
+        bills = get_bills_historical(fetcher, congress, since) if since else get_bills_historical(fetcher, congress)
+        async for bill_batch in bills:
+            await pages.put(bill_batch)
+        await pages.put(DONE)
+
+    async def enrich_pages():
+        while (bill_batch := await pages.get()) is not DONE:
+            # Only this page's bills are looked up; no map of the whole collection
+            existing = await asyncio.to_thread(load_bills_by_keys, bill_batch)
+            # filter out bills that are already in the db AND have text
+            new_bills = [
+                bill for bill in bill_batch
+                if not (existing.get(bill_key(bill)) or {}).get('text_link')
+            ]
+            if new_bills:
+                # Enrich concurrently; add all bills, even those without text
+                await enrich_bills(fetcher, new_bills)
+            # Pages are sorted by updateDate, so only that is safe to resume from
+            latest = max((sort_timestamp(bill) for bill in bill_batch), default='')
+            await enriched.put((new_bills, latest))
+        await enriched.put(DONE)
+
+    async def write_pages():
+        nonlocal pages_done
+        checkpoint = saved = None
+        # One writer for the whole backfill: pages are written in batches,
+        # and on a timer when pages arrive slowly
+        with writer:
+            while True:
+                try:
+                    item = await asyncio.wait_for(enriched.get(), timeout=writer.flush_interval)
+                except asyncio.TimeoutError:
+                    written = await asyncio.to_thread(writer.flush_if_due)
+                else:
+                    if item is DONE:
+                        break
+                    new_bills, latest = item
+                    written = await asyncio.to_thread(writer.add_page, new_bills)
+                    checkpoint = latest or checkpoint
+                    pages_done += 1
+                    elapsed = (datetime.now() - started).total_seconds()
+                    print(f"Page {pages_done}: {len(new_bills)} bills to store; "
+                          f"{totals['inserted']} inserted, {totals['modified']} modified, "
+                          f"{totals['unchanged']} unchanged so far ({elapsed:.0f}s)")
+                # Everything up to the checkpoint is stored, so a restart can skip it
+                if written and checkpoint and checkpoint != saved:
+                    await asyncio.to_thread(save_checkpoint, checkpoint_name, checkpoint)
+                    saved = checkpoint
+
+            await asyncio.to_thread(writer.flush)
+            if checkpoint and checkpoint != saved:
+                await asyncio.to_thread(save_checkpoint, checkpoint_name, checkpoint)
+
+    stages = [asyncio.create_task(stage()) for stage in (fetch_pages, enrich_pages, write_pages)]
+    try:
+        await asyncio.gather(*stages)
+    finally:
+        # If one stage fails, stop the others instead of leaving them blocked on a queue
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+
+    print(f"Done: {pages_done} pages, {totals['inserted']} inserted, "
+          f"{totals['modified']} modified, {totals['unchanged']} unchanged")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Historical bill monitoring service")
     parser.add_argument("--congress", type=int, help="The congress number to fetch bills for", default=118)
+    parser.add_argument("--since", help="Only bills updated at or after this ISO timestamp; "
+                                        "overrides the saved checkpoint")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the saved checkpoint and start from the beginning (or --since)")
     args = parser.parse_args()
     congress = args.congress
-    main(congress)
+    asyncio.run(main(congress, args.since, args.restart))
@@ -1,13 +1,20 @@
 """
 This is a simple script that periodically downloads bills from cpo.congress.gov, and saves them to a local DB
+
+Each poll pages forward from the last seen update time of every tracked congress
+(a checkpoint stored in MongoDB), so its cost depends on how many bills changed,
+not on how many bills are in the database.
 """
 
-import time
+import asyncio
+import os
 from datetime import datetime
 
 from env_utils import IS_PROD
-from congress_utils import enrich_bill, fetch_recent_bills
-from db_utils import load_existing_bills, add_to_db
+from congress_utils import enrich_bills, fetch_updated_bills
+from db_utils import BulkUpsertWriter, load_bills_by_keys, get_checkpoint, save_checkpoint
+from fetch_engine import CongressFetcher
+from sync_utils import classify_page, congress_start, current_congress, stale_text_keys, sort_timestamp
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,40 +24,60 @@ load_dotenv()
 POLLING_INTERVAL = 1800 if IS_PROD else 5  # Check every half an hour
 
 
-def main():
+def tracked_congresses():
+    """Congresses to keep in sync (SYNC_CONGRESSES=117,118 or the current one)"""
+    configured = os.getenv("SYNC_CONGRESSES")
+    if configured:
+        return [int(c) for c in configured.split(",") if c.strip()]
+    return [current_congress()]
+
+
+async def main():
     print("Starting bill monitoring service...")
-    
-    while True:
-        # Get existing bill numbers from MongoDB
-        existing_bills = load_existing_bills()
-        existing_bills_map = {
-            f"{bill['congress']}-{bill['type']}-{bill['number']}": bill.get('text_link')
-            for bill in existing_bills
-        }
-
-        # Fetch new bills
-        bills = fetch_recent_bills()
-        bills = bills["bills"]
-        
-        # Filter out bills that are already in the db AND have text
-        bills = [
-            bill for bill in bills 
-            if (f"{bill['congress']}-{bill['type']}-{bill['number']}" not in existing_bills_map or
-                not existing_bills_map[f"{bill['congress']}-{bill['type']}-{bill['number']}"])  # Check text_link in existing bill
-        ]
-
-        if bills:
-            print(f"Found {len(bills)} bills to process")
-            processed_bills = []
-            for bill in bills:
-                enriched = enrich_bill(bill)
-                bill['has_text'] = enriched  # Track whether bill has text
-                processed_bills.append(bill)  # Add all bills, even those without text
-            add_to_db(processed_bills)
-        else:
-            print("No new or text-less bills found")
-        
-        time.sleep(POLLING_INTERVAL)
+
+    async with CongressFetcher() as fetcher:
+        while True:
+            for congress in tracked_congresses():
+                await sync_congress(fetcher, congress)
+            await asyncio.sleep(POLLING_INTERVAL)
+
+async def sync_congress(fetcher, congress):
+    checkpoint_name = f"bills:{congress}"
+    since = get_checkpoint(checkpoint_name) or congress_start(congress)
+    print(f"Syncing congress {congress} from {since}")
+
+    saved = since
+    # One writer for the whole run, so small pages are written together
+    with BulkUpsertWriter() as writer:
+        async for bills in fetch_updated_bills(fetcher, congress, since):
+            # Only the stored versions of this page's bills are loaded
+            existing = await asyncio.to_thread(load_bills_by_keys, bills)
+            to_enrich, to_update = classify_page(bills, existing)
+
+            if to_enrich or to_update:
+                # Enrich concurrently; add all bills, even those without text
+                await enrich_bills(fetcher, to_enrich)
+                stale = stale_text_keys(to_enrich, existing)
+                written = await asyncio.to_thread(writer.add_page, to_enrich + to_update, stale)
+            else:
+                written = await asyncio.to_thread(writer.flush_if_due)
+
+            # Pages come oldest updateDate first, so the checkpoint only moves forward
+            latest = max((sort_timestamp(bill) for bill in bills), default='')
+            if latest > since:
+                since = latest
+            # ...and only past bills that are already written
+            if written and since != saved:
+                await asyncio.to_thread(save_checkpoint, checkpoint_name, since)
+                saved = since
+
+        await asyncio.to_thread(writer.flush)
+        if since != saved:
+            await asyncio.to_thread(save_checkpoint, checkpoint_name, since)
+
+    counts = writer.stats
+    print(f"Congress {congress}: {counts['inserted']} inserted, {counts['modified']} modified, "
+          f"{counts['unchanged']} unchanged")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Helpers for the incremental sync: bill identity, change detection and
+update-date checkpoints.
+"""
+
+import re
+from datetime import datetime
+
+# Fields of the bill list payload that change when Congress acts on a bill
+TRACKED_FIELDS = ('updateDate', 'updateDateIncludingText', 'latestAction', 'title')
+
+
+def bill_key(bill):
+    return f"{bill['congress']}-{bill['type']}-{bill['number']}"
+
+
+def search_terms(bill):
+    """
+    Lowercase title words and identifiers ("hr1234", "1234") the API's prefix
+    search matches against; keep in sync with search_terms in bill_search.py
+    """
+    terms = set(re.findall(r"[a-z0-9]+", (bill.get('title') or '').lower()))
+    number = str(bill.get('number', '')).lower()
+    if number:
+        terms.add(number)
+        terms.add(f"{str(bill.get('type', '')).lower()}{number}")
+    return sorted(terms)
+
+
+def current_congress():
+    """The congress in session today (the 1st convened in 1789, a new one every two years)"""
+    return (datetime.utcnow().year - 1789) // 2 + 1
+
+
+def congress_start(congress):
+    """Checkpoint to use for a congress that has never been synced"""
+    return f"{1789 + 2 * (congress - 1)}-01-01T00:00:00Z"
+
+
+def as_timestamp(value):
+    """A list payload date or timestamp as an ISO timestamp ('' if missing)"""
+    value = value or ''
+    if value and 'T' not in value:
+        value = f"{value}T00:00:00Z"
+    return value
+
+
+def update_timestamp(bill):
+    """
+    The most precise update time the list payload gives for a bill, for
+    change detection. Not a checkpoint: updateDateIncludingText can be later
+    than the updateDate the list is filtered and sorted on.
+    """
+    return as_timestamp(bill.get('updateDateIncludingText') or bill.get('updateDate'))
+
+
+def sort_timestamp(bill):
+    """
+    The bill's updateDate, the key fromDateTime filters and the list is
+    sorted on; checkpoints must only ever be set from this
+    """
+    return as_timestamp(bill.get('updateDate'))
+
+
+def classify_page(bills, existing):
+    """
+    Split a page of bills from the API into what needs to be done for each.
+
+    Args:
+        bills: Bills from the list endpoint
+        existing: Stored bills keyed by bill_key (see db_utils.load_bills_by_keys)
+
+    Returns:
+        (to_enrich, to_update): bills that are new, have no text yet or have
+        new text (need their text links fetched), and bills whose metadata
+        changed (e.g. a new latestAction) and only need updating in place.
+        Unchanged bills are in neither list.
+    """
+    to_enrich, to_update = [], []
+    for bill in bills:
+        old = existing.get(bill_key(bill))
+        if old is None or not old.get('text_link'):
+            to_enrich.append(bill)
+        elif bill.get('updateDateIncludingText') and bill.get('updateDateIncludingText') != old.get('updateDateIncludingText'):
+            to_enrich.append(bill)
+        elif any(bill.get(field) != old.get(field) for field in TRACKED_FIELDS if field in bill):
+            to_update.append(bill)
+    return to_enrich, to_update
+
+
+def stale_text_keys(enriched, existing):
+    """
+    Keys of enriched bills whose text link changed, so their summary and
+    vectors were computed from an old text version. Also keeps the stored
+    links of bills whose re-enrichment failed instead of overwriting them.
+    """
+    stale = set()
+    for bill in enriched:
+        old = existing.get(bill_key(bill))
+        if old is None:
+            continue
+        if not bill.get('has_text'):
+            for field in ('pdf_link', 'text_link'):
+                if old.get(field):
+                    bill.pop(field, None)
+        elif old.get('text_link') and old.get('text_link') != bill.get('text_link'):
+            stale.add(bill_key(bill))
+    return stale
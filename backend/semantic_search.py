@@ -0,0 +1,142 @@
+"""
+Cross-bill semantic search for /api/search/semantic.
+
+The query is embedded once and the best chunks across all bills are
+retrieved with any congress/bill type filter applied inside the index.
+Chunks are then grouped by bill: a bill ranks by its best chunk, with a
+small bonus for every further matching chunk, and carries its best chunks
+as snippets. Results of repeated (popular) queries are served from an
+in-process TTL cache.
+"""
+
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from bill_cache import TTLCache
+
+# Chunks retrieved per bill asked for; more chunks give better grouping
+CHUNKS_PER_RESULT = 5
+MAX_CHUNKS = 100
+
+# Score added for each matching chunk of a bill beyond its best one
+EXTRA_CHUNK_BONUS = 0.02
+MAX_EXTRA_BONUS = 0.1
+
+SNIPPETS_PER_BILL = 2
+SNIPPET_CHARS = 300
+
+
+class SemanticBillResult(BaseModel):
+    bill_id: str
+    bill_type: Optional[str] = None
+    congress: Optional[int] = None
+    title: Optional[str] = None
+    score: float
+    matched_chunks: int
+    snippets: List[str]
+
+
+class SemanticSearchResponse(BaseModel):
+    query: str
+    results: List[SemanticBillResult]
+
+
+def snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def group_matches(matches: List[dict], limit: int) -> List[dict]:
+    """
+    Rank bills from chunk matches (best first).
+
+    Args:
+        matches: Chunk matches with bill_id, bill_type, congress, title, text and score
+        limit: Number of bills to return
+
+    Returns:
+        Up to `limit` SemanticBillResult dicts, best bill first
+    """
+    bills = {}
+    for match in matches:
+        key = (str(match.get("bill_id")), match.get("bill_type"), match.get("congress"))
+        bill = bills.get(key)
+        if bill is None:
+            congress = match.get("congress")
+            bill = bills[key] = {
+                "bill_id": key[0],
+                "bill_type": match.get("bill_type"),
+                "congress": int(congress) if congress is not None else None,
+                "title": match.get("title"),
+                "best": match.get("score") or 0.0,
+                "matched_chunks": 0,
+                "snippets": [],
+                "_seen": set()
+            }
+        bill["matched_chunks"] += 1
+        text = snippet(match.get("text") or "")
+        # Overlapping chunks can repeat the same passage
+        if text and text not in bill["_seen"] and len(bill["snippets"]) < SNIPPETS_PER_BILL:
+            bill["_seen"].add(text)
+            bill["snippets"].append(text)
+
+    results = []
+    for bill in bills.values():
+        bonus = min(MAX_EXTRA_BONUS, EXTRA_CHUNK_BONUS * (bill["matched_chunks"] - 1))
+        results.append({
+            "bill_id": bill["bill_id"],
+            "bill_type": bill["bill_type"],
+            "congress": bill["congress"],
+            "title": bill["title"],
+            "score": round(bill["best"] + bonus, 6),
+            "matched_chunks": bill["matched_chunks"],
+            "snippets": bill["snippets"]
+        })
+    results.sort(key=lambda result: result["score"], reverse=True)
+    return results[:limit]
+
+
+class SemanticSearch:
+    def __init__(self, pinecone_client, max_entries: int = 500, ttl: float = 600):
+        """
+        Args:
+            pinecone_client: PineconeClient used for retrieval
+            max_entries: Distinct queries kept in the result cache
+            ttl: Seconds a cached result is served
+        """
+        self.pinecone_client = pinecone_client
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    @classmethod
+    def from_env(cls, pinecone_client) -> "SemanticSearch":
+        return cls(
+            pinecone_client,
+            max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500")),
+            ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "600"))
+        )
+
+    async def search(self, query: str, congress: Optional[int] = None,
+                     bill_type: Optional[str] = None, limit: int = 10) -> List[dict]:
+        # The normalized query is both the cache key and what is embedded
+        query = " ".join(query.split()).lower()
+        bill_type = bill_type.upper() if bill_type else None
+        key = (query, congress, bill_type, limit)
+
+        async def load():
+            # Errors propagate to the endpoint; empty results are not cached
+            matches = await self.pinecone_client.search_chunks(
+                query,
+                congress=congress,
+                bill_type=bill_type,
+                top_k=min(MAX_CHUNKS, limit * CHUNKS_PER_RESULT)
+            )
+            return group_matches(matches, limit) or None
+
+        return await self.cache.get_or_load(key, load) or []
+
+    def stats(self) -> dict:
+        return self.cache.stats()
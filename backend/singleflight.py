@@ -0,0 +1,106 @@
+import asyncio
+import os
+import socket
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Run at most one instance of an expensive keyed task at a time.
+
+    Within a process, concurrent callers for the same key share one asyncio
+    task. Across workers, a lease document in MongoDB elects a single leader;
+    the other workers poll `wait_for` until the leader's result is visible
+    (e.g. the summary has been written to the bill), or take over the lease
+    if the leader dies and the lease expires.
+    """
+
+    def __init__(self, lease_seconds: float = 120, poll_interval: float = 0.5):
+        """
+        Args:
+            lease_seconds: How long a worker may hold a lease before others may take over
+            poll_interval: Seconds between checks for another worker's result
+        """
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.collection = None  # Motor collection for leases, set on startup
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def setup(self, collection):
+        """Use `collection` for cross-worker leases; expired leases are removed by a TTL index"""
+        self.collection = collection
+        await collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable],
+                 wait_for: Optional[Callable[[], Awaitable]] = None):
+        """
+        Run `fn` once for `key`, sharing its result with concurrent callers.
+
+        Args:
+            key: Identity of the task (e.g. "summary:118:HR:1")
+            fn: Coroutine function doing the work
+            wait_for: Coroutine function returning another worker's result, or
+                None while it is not available yet. Without it only in-process
+                coalescing is done.
+
+        Returns:
+            The result of `fn` (or of the worker that ran it)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, fn, wait_for))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # Shield so one caller going away does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every caller went away
+
+    async def _run(self, key: str, fn, wait_for):
+        if self.collection is None or wait_for is None:
+            return await fn()
+
+        while True:
+            if await self._acquire(key):
+                try:
+                    return await fn()
+                finally:
+                    await self._release(key)
+
+            # Another worker holds the lease; wait for its result
+            await asyncio.sleep(self.poll_interval)
+            result = await wait_for()
+            if result is not None:
+                return result
+
+    async def _acquire(self, key: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            # Matches only a missing or expired lease; a live lease makes the
+            # upsert collide on _id
+            await self.collection.update_one(
+                {"_id": key, "expires_at": {"$lt": now}},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _release(self, key: str):
+        try:
+            await self.collection.delete_one({"_id": key, "owner": self.owner})
+        except Exception as e:
+            logger.warning(f"Failed to release lease {key}: {str(e)}")
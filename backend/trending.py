@@ -0,0 +1,248 @@
+"""
+Trending bills engine.
+
+A bill's trending score combines:
+  - recency of its latest action, decayed with a half-life
+  - action velocity: distinct action dates in the last VELOCITY_DAYS
+    (the scraper appends each latestAction date to `action_dates`)
+  - views and chats recorded by the API, bucketed per day in the
+    bill_activity collection and decayed with the same half-life
+
+A periodic job aggregates those signals and materializes the top bills as a
+single document in the `trending` collection, and as pre-serialized JSON in
+memory, so /api/trending-bills is one O(1) read. Each refresh replaces the
+snapshot as a whole, so readers never see a half-built ranking. When few
+bills have any signal (a recess, a freshly backfilled database) the snapshot
+is filled up with the most recently acted-on bills.
+"""
+
+import asyncio
+import logging
+import math
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+import orjson
+from pymongo import UpdateOne
+
+from bill_listing import LIST_PROJECTION, bill_list_item
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ID = "current"
+
+# Score weights
+ACTION_WEIGHT = 3.0
+VELOCITY_WEIGHT = 1.0
+VIEW_WEIGHT = 1.0
+CHAT_WEIGHT = 2.0
+
+VELOCITY_DAYS = 14
+ACTIVITY_KINDS = ("views", "chats")
+
+
+class TrendingEngine:
+    """
+    Computes and serves the trending bills snapshot.
+
+    record() only counts events in memory; the counters are written to
+    bill_activity in one bulk write per flush, so recording costs the request
+    path nothing. Several API processes can run the engine: a process only
+    recomputes when the stored snapshot is older than refresh_seconds and
+    otherwise adopts the stored one.
+    """
+
+    def __init__(self, bills, activity, snapshots, size: int = 50,
+                 refresh_seconds: float = 300, flush_seconds: float = 30,
+                 half_life_days: float = 7, window_days: int = 30,
+                 candidates: int = 1000):
+        """
+        Args:
+            bills: Motor collection of bills
+            activity: Motor collection of per-day view/chat counters
+            snapshots: Motor collection holding the materialized snapshot
+            size: Number of bills in the snapshot
+            refresh_seconds: How often the snapshot is recomputed
+            flush_seconds: How often recorded views/chats are written
+            half_life_days: Age at which an action or view counts half
+            window_days: Only actions and activity this recent are considered
+            candidates: Most recently acted-on bills scored per refresh
+        """
+        self.bills = bills
+        self.activity = activity
+        self.snapshots = snapshots
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self.flush_seconds = flush_seconds
+        self.half_life_days = half_life_days
+        self.window_days = window_days
+        self.candidates = candidates
+        self.body = b"[]"
+        self.computed_at: Optional[datetime] = None
+        self._pending = Counter()
+        self._tasks = []
+
+    @classmethod
+    def from_env(cls, db) -> "TrendingEngine":
+        return cls(
+            db.bills, db.bill_activity, db.trending,
+            size=int(os.getenv("TRENDING_SIZE", "50")),
+            refresh_seconds=float(os.getenv("TRENDING_REFRESH_SECONDS", "300")),
+            half_life_days=float(os.getenv("TRENDING_HALF_LIFE_DAYS", "7")),
+            window_days=int(os.getenv("TRENDING_WINDOW_DAYS", "30"))
+        )
+
+    async def setup(self):
+        await self.activity.create_index("day", expireAfterSeconds=self.window_days * 2 * 86400)
+        # Candidates are read through the (latestAction.actionDate, _id) list index
+        await self.load()
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._every(self.refresh_seconds, self.refresh_if_stale)),
+            asyncio.create_task(self._every(self.flush_seconds, self.flush))
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.flush()
+
+    async def _every(self, seconds: float, fn):
+        while True:
+            try:
+                await fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Trending job {fn.__name__} failed: {str(e)}")
+            await asyncio.sleep(seconds)
+
+    def record(self, congress: int, bill_type: str, number: str, kind: str):
+        """Count a view or chat of a bill"""
+        self._pending[(int(congress), bill_type.upper(), str(number), kind)] += 1
+
+    async def flush(self):
+        """Write the recorded views/chats to today's activity buckets"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+        day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        increments = {}
+        for (congress, bill_type, number, kind), count in pending.items():
+            increments.setdefault((congress, bill_type, number), {})[kind] = count
+        await self.activity.bulk_write([
+            UpdateOne(
+                {"_id": f"{congress}-{bill_type}-{number}:{day.date().isoformat()}"},
+                {
+                    "$inc": counts,
+                    "$setOnInsert": {"congress": congress, "type": bill_type, "number": number, "day": day}
+                },
+                upsert=True
+            )
+            for (congress, bill_type, number), counts in increments.items()
+        ], ordered=False)
+
+    async def load(self) -> bool:
+        """Adopt the stored snapshot; returns False if there is none"""
+        snapshot = await self.snapshots.find_one({"_id": SNAPSHOT_ID})
+        if not snapshot:
+            return False
+        self.body = orjson.dumps(snapshot["bills"])
+        self.computed_at = snapshot["computed_at"]
+        return True
+
+    async def refresh_if_stale(self):
+        await self.load()
+        if self.computed_at and datetime.utcnow() - self.computed_at < timedelta(seconds=self.refresh_seconds):
+            return
+        await self.refresh()
+
+    async def refresh(self):
+        """Recompute the ranking and replace the snapshot"""
+        now = datetime.utcnow()
+        scores = await self._scores(now)
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:self.size]
+
+        rows = {}
+        if top:
+            query = {"$or": [
+                {"congress": congress, "type": bill_type, "number": number}
+                for (congress, bill_type, number), _ in top
+            ]}
+            async for bill in self.bills.find(query, LIST_PROJECTION):
+                rows[(bill.get("congress"), bill.get("type"), bill.get("number"))] = bill_list_item(bill)
+        bills = [rows[key] for key, _ in top if key in rows]
+        if len(bills) < self.size:
+            bills += await self._most_recent(self.size - len(bills), exclude=set(rows))
+
+        await self.snapshots.replace_one(
+            {"_id": SNAPSHOT_ID},
+            {"bills": bills, "computed_at": now},
+            upsert=True
+        )
+        self.body = orjson.dumps(bills)
+        self.computed_at = now
+        logger.info(f"Trending snapshot refreshed with {len(bills)} bills")
+
+    async def _most_recent(self, count: int, exclude: set) -> list:
+        """The `count` most recently acted-on bills not in `exclude`"""
+        bills = []
+        cursor = self.bills.find({}, LIST_PROJECTION).sort([("latestAction.actionDate", -1), ("_id", -1)])
+        async for bill in cursor.limit(count + len(exclude)):
+            if (bill.get("congress"), bill.get("type"), bill.get("number")) not in exclude:
+                bills.append(bill_list_item(bill))
+                if len(bills) == count:
+                    break
+        return bills
+
+    async def _scores(self, now: datetime) -> dict:
+        decay = math.log(2) / self.half_life_days
+        since = (now - timedelta(days=self.window_days)).date().isoformat()
+        velocity_since = (now - timedelta(days=VELOCITY_DAYS)).date().isoformat()
+        scores = Counter()
+
+        # Recently acted-on bills: recency and velocity
+        async for bill in self.bills.aggregate([
+            {"$match": {"latestAction.actionDate": {"$gte": since}}},
+            {"$sort": {"latestAction.actionDate": -1}},
+            {"$limit": self.candidates},
+            {"$project": {
+                "_id": 0, "congress": 1, "type": 1, "number": 1,
+                "action_date": "$latestAction.actionDate",
+                "recent_actions": {"$size": {"$filter": {
+                    "input": {"$ifNull": ["$action_dates", []]},
+                    "cond": {"$gte": ["$$this", velocity_since]}
+                }}}
+            }}
+        ]):
+            key = (bill["congress"], bill["type"], bill["number"])
+            try:
+                age_days = (now - datetime.fromisoformat(bill["action_date"][:10])).days
+            except (TypeError, ValueError):
+                continue
+            scores[key] += ACTION_WEIGHT * math.exp(-decay * max(age_days, 0))
+            scores[key] += VELOCITY_WEIGHT * math.log1p(bill["recent_actions"])
+
+        # Views and chats, each day's bucket decayed by its age
+        day_ms = 86400 * 1000
+        weight = {"$exp": {"$multiply": [-decay / day_ms, {"$subtract": [now, "$day"]}]}}
+        async for activity in self.activity.aggregate([
+            {"$match": {"day": {"$gte": now - timedelta(days=self.window_days)}}},
+            {"$group": {
+                "_id": {"congress": "$congress", "type": "$type", "number": "$number"},
+                **{
+                    kind: {"$sum": {"$multiply": [{"$ifNull": [f"${kind}", 0]}, weight]}}
+                    for kind in ACTIVITY_KINDS
+                }
+            }}
+        ]):
+            key = (activity["_id"]["congress"], activity["_id"]["type"], activity["_id"]["number"])
+            scores[key] += VIEW_WEIGHT * math.log1p(activity["views"])
+            scores[key] += CHAT_WEIGHT * math.log1p(activity["chats"])
+
+        return scores
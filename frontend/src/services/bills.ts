@@ -20,7 +20,8 @@ export const billsService = {
     return response.data;
   },
   searchBills: async (query: string): Promise<Bill[]> => {
-    const response = await apiClient.get(`/search?query=${query}`);
+    // Typeahead: the last word is usually still being typed, so match it as a prefix
+    const response = await apiClient.get('/search', { params: { query, mode: 'prefix' } });
     return response.data;
   },
   getSummary: async (congress: number, bill_type: string, bill_id: string): Promise<string> => {